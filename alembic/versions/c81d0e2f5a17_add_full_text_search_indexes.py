@@ -0,0 +1,51 @@
+"""Add full-text search indexes on support_tickets and properties
+
+Postgres only: GIN indexes over the weighted tsvector expressions that
+app/search.py queries with. The expressions must stay identical to the
+ones built by SearchSpec, or the planner will not use the indexes. Built
+CONCURRENTLY so large tables stay writable meanwhile.
+
+Revision ID: c81d0e2f5a17
+Revises: a4c42b7dc792
+Create Date: 2026-10-18 07:41:09.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c81d0e2f5a17'
+down_revision: Union[str, None] = 'a4c42b7dc792'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TICKETS_DOCUMENT = (
+    "setweight(to_tsvector('english', coalesce(subject, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+)
+PROPERTIES_DOCUMENT = (
+    "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(location, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+)
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    with op.get_context().autocommit_block():
+        op.create_index('ix_support_tickets_search', 'support_tickets', [sa.text(f"({TICKETS_DOCUMENT})")],
+                        postgresql_using='gin', postgresql_concurrently=True)
+        op.create_index('ix_properties_search', 'properties', [sa.text(f"({PROPERTIES_DOCUMENT})")],
+                        postgresql_using='gin', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_properties_search', table_name='properties', postgresql_concurrently=True)
+        op.drop_index('ix_support_tickets_search', table_name='support_tickets', postgresql_concurrently=True)
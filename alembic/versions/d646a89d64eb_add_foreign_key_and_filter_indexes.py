@@ -0,0 +1,43 @@
+"""Add foreign key and filter indexes
+
+Revision ID: d646a89d64eb
+Revises: e2a60b77b652
+Create Date: 2026-10-18 09:12:41.402118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd646a89d64eb'
+down_revision: Union[str, None] = 'e2a60b77b652'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# tenants.user_id is already covered by its unique constraint, and the
+# composite indexes lead with payments.tenant_id and units.property_id.
+INDEXES = [
+    ('ix_properties_admin_id', 'properties', ['admin_id']),
+    ('ix_units_property_id_status', 'units', ['property_id', 'status']),
+    ('ix_leases_tenant_id', 'leases', ['tenant_id']),
+    ('ix_leases_unit_id', 'leases', ['unit_id']),
+    ('ix_payments_tenant_id_created_at', 'payments', ['tenant_id', 'created_at']),
+    ('ix_payments_lease_id', 'payments', ['lease_id']),
+    ('ix_support_tickets_tenant_id', 'support_tickets', ['tenant_id']),
+]
+
+
+def upgrade() -> None:
+    # Build without blocking writes on Postgres; CONCURRENTLY cannot run in a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
@@ -0,0 +1,45 @@
+from fastapi import HTTPException
+from sqlalchemy import Integer, String, column, or_, select, update
+
+from app.config import settings
+from app.database import values_table
+
+# Columns of the literal table the changes are joined from
+CHANGES = (column("id", Integer), column("status", String), column("expected_status", String))
+
+
+# Apply a list of {id, status, expected_status} changes to model.status
+# with a single UPDATE ... FROM joined on id. A change that carries
+# expected_status only applies while the row still has that status, so
+# two admins working from the same listing cannot overwrite each other.
+def apply_status_changes(db, model, changes) -> dict:
+    if len(changes) > settings.BATCH_UPDATE_MAX:
+        raise HTTPException(status_code=400, detail=f"At most {settings.BATCH_UPDATE_MAX} changes per request")
+    ids = [change.id for change in changes]
+    if len(set(ids)) != len(ids):
+        raise HTTPException(status_code=400, detail="Each id may appear only once")
+    if not changes:
+        return {"updated": [], "rejected": []}
+
+    rows = values_table(db.bind, "changes", CHANGES,
+                        [(change.id, change.status, change.expected_status) for change in changes])
+    updated = set(db.scalars(
+        update(model)
+        .where(model.id == rows.c.id, or_(rows.c.expected_status.is_(None), model.status == rows.c.expected_status))
+        .values(status=rows.c.status)
+        .returning(model.id)
+        .execution_options(synchronize_session=False)
+    ).all())
+
+    # Tell a lost race apart from an unknown id, inside the same transaction
+    rejected = []
+    missed = [i for i in ids if i not in updated]
+    if missed:
+        current = dict(db.execute(select(model.id, model.status).where(model.id.in_(missed))).all())
+        rejected = [
+            {"id": i, "reason": "conflict", "current_status": current[i]} if i in current
+            else {"id": i, "reason": "not_found", "current_status": None}
+            for i in missed
+        ]
+    db.commit()
+    return {"updated": [i for i in ids if i in updated], "rejected": rejected}
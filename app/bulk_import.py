@@ -0,0 +1,146 @@
+import codecs
+import csv
+import json
+from itertools import islice
+
+from fastapi import HTTPException, UploadFile
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+
+from app.config import settings
+
+FORMATS = {
+    ".csv": "csv",
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+}
+
+
+def _upload_format(upload: UploadFile, fmt) -> str:
+    if fmt is None:
+        suffix = "." + (upload.filename or "").rsplit(".", 1)[-1].lower()
+        fmt = FORMATS.get(suffix, "csv" if upload.content_type == "text/csv" else "ndjson")
+    if fmt == "jsonl":
+        fmt = "ndjson"
+    if fmt not in ("csv", "ndjson"):
+        raise HTTPException(status_code=400, detail=f"Unsupported import format '{fmt}'")
+    return fmt
+
+
+def _error(loc, msg, type_):
+    return {"loc": list(loc), "msg": msg, "type": type_}
+
+
+# Yield (row number, record, parse error) for every record in the upload.
+# Empty CSV cells are dropped so schema defaults apply.
+def _records(upload: UploadFile, fmt: str):
+    lines = codecs.iterdecode(upload.file, "utf-8-sig")
+    if fmt == "csv":
+        for number, record in enumerate(csv.DictReader(lines), start=1):
+            yield number, {k: v for k, v in record.items() if k and v not in ("", None)}, None
+        return
+
+    number = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield number, None, _error((), f"Invalid JSON: {e}", "json_invalid")
+            continue
+        if not isinstance(record, dict):
+            yield number, None, _error((), "Expected a JSON object", "dict_type")
+            continue
+        yield number, record, None
+
+
+# Chunked import of CSV/NDJSON rows into one table. Rows are validated
+# with `schema` and turned into column values by `to_row`; `references`
+# maps a field to a callable returning which of a set of ids exist, so
+# foreign keys cost one query per chunk. Valid rows of a chunk go out as
+# one multi-row INSERT ... RETURNING in their own transaction. If the
+# database rejects the batch, the chunk is retried row by row in
+# savepoints so the report still points at the offending rows.
+class BulkImport:
+    def __init__(self, model, schema, to_row, references=None, chunk_size=None):
+        self.model = model
+        self.schema = schema
+        self.to_row = to_row
+        self.references = references or {}
+        self.chunk_size = chunk_size or settings.BULK_IMPORT_CHUNK_SIZE
+
+    def run(self, db, upload: UploadFile, fmt=None) -> dict:
+        report = {"inserted": 0, "failed": 0, "created": [], "errors": []}
+        records = _records(upload, _upload_format(upload, fmt))
+        while True:
+            chunk = list(islice(records, self.chunk_size))
+            if not chunk:
+                break
+            self._import_chunk(db, chunk, report)
+        report["errors"].sort(key=lambda error: error["row"])
+        report["failed"] = len(report["errors"])
+        return report
+
+    def _validate(self, db, chunk, report):
+        valid = []
+        for number, record, error in chunk:
+            if error is not None:
+                report["errors"].append({"row": number, "errors": [error]})
+                continue
+            try:
+                valid.append((number, self.schema.model_validate(record)))
+            except ValidationError as e:
+                report["errors"].append({"row": number, "errors": e.errors(include_url=False, include_context=False)})
+
+        for field, existing in self.references.items():
+            wanted = {getattr(item, field) for _, item in valid if getattr(item, field) is not None}
+            found = existing(db, wanted) if wanted else set()
+            kept = []
+            for number, item in valid:
+                value = getattr(item, field)
+                if value is not None and value not in found:
+                    report["errors"].append({"row": number, "errors": [_error((field,), f"{field} {value} not found", "not_found")]})
+                else:
+                    kept.append((number, item))
+            valid = kept
+        return valid
+
+    def _import_chunk(self, db, chunk, report):
+        valid = self._validate(db, chunk, report)
+        if not valid:
+            return
+        rows = [self.to_row(item) for _, item in valid]
+        stmt = insert(self.model).returning(self.model.id, sort_by_parameter_order=True)
+        try:
+            ids = db.scalars(stmt, rows).all()
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            self._import_rows(db, valid, rows, report)
+            return
+        report["inserted"] += len(ids)
+        report["created"].extend({"row": number, "id": id_} for (number, _), id_ in zip(valid, ids))
+
+    def _import_rows(self, db, valid, rows, report):
+        stmt = insert(self.model).returning(self.model.id)
+        for (number, _), row in zip(valid, rows):
+            try:
+                with db.begin_nested():
+                    id_ = db.scalar(stmt, row)
+            except IntegrityError as e:
+                report["errors"].append({"row": number, "errors": [_error((), str(e.orig), "integrity_error")]})
+                continue
+            report["inserted"] += 1
+            report["created"].append({"row": number, "id": id_})
+        db.commit()
+
+
+# Reference checker for a foreign key: which of `ids` exist in `column`,
+# optionally restricted by extra WHERE clauses
+def existing_ids(column, *where):
+    def check(db, ids):
+        return set(db.scalars(select(column).where(column.in_(ids), *where)))
+    return check
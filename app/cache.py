@@ -0,0 +1,123 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+# Thread-safe LRU cache whose entries also expire after ttl seconds
+class TTLCache:
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl: float = None):
+        with self._lock:
+            self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        return {"size": len(self), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+    def __len__(self):
+        return len(self._data)
+
+
+# Cache backends store opaque bytes under string keys. They know nothing
+# about invalidation: callers put the version of every table an entry was
+# built from into its key (see app/response_cache.py), and entries keyed on
+# an old version age out on their own. Each backend has a blocking get/set
+# for sync code and an aget/aset for the event loop.
+
+# In-process LRU, one per worker
+class LocalBackend:
+    name = "local"
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.entries = TTLCache(maxsize, ttl)
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def set(self, key, value: bytes):
+        self.entries.set(key, value)
+
+    # Memory only, so never blocks the loop
+    async def aget(self, key):
+        return self.entries.get(key)
+
+    async def aset(self, key, value: bytes):
+        self.entries.set(key, value)
+
+    def stats(self) -> dict:
+        return {"size": len(self.entries), "maxsize": self.entries.maxsize, "evictions": self.entries.evictions}
+
+
+# Shared across workers through Redis: a blocking client for the
+# threadpool and a redis.asyncio one for async endpoints. Evictions are the
+# server's business and not counted.
+class SharedBackend:
+    name = "shared"
+
+    def __init__(self, client, aclient, ttl: float, prefix: str = "rc:"):
+        self.client = client
+        self.aclient = aclient
+        self.ttl = ttl
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, ttl: float):
+        try:
+            import redis
+            import redis.asyncio
+        except ImportError:
+            raise RuntimeError("RESPONSE_CACHE_URL needs the 'redis' package installed")
+        return cls(
+            redis.Redis.from_url(url, socket_timeout=0.5),
+            redis.asyncio.Redis.from_url(url, socket_timeout=0.5),
+            ttl,
+        )
+
+    def get(self, key):
+        return self.client.get(self.prefix + key)
+
+    def set(self, key, value: bytes):
+        self.client.set(self.prefix + key, value, ex=int(self.ttl))
+
+    async def aget(self, key):
+        return await self.aclient.get(self.prefix + key)
+
+    async def aset(self, key, value: bytes):
+        await self.aclient.set(self.prefix + key, value, ex=int(self.ttl))
+
+    def stats(self) -> dict:
+        return {}
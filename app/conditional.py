@@ -0,0 +1,63 @@
+import hashlib
+from datetime import timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Depends, HTTPException, Request, Response
+
+from app.database import async_engine
+from app.routers.auth import get_current_user
+from app.versioning import table_versions
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    candidates = [tag.strip() for tag in header.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def _not_modified_since(header: str, last_modified) -> bool:
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return last_modified.replace(microsecond=0) <= since
+
+
+# Dependency for read endpoints backed by `tables`. The ETag hashes the
+# request URL, the caller and the tables' version counters, so it is
+# computed from one primary-key lookup on table_versions; a matching
+# If-None-Match (or a fresh If-Modified-Since) short-circuits with 304
+# before the endpoint queries or serializes anything.
+def conditional(*tables):
+    async def check(request: Request, response: Response, current_user=Depends(get_current_user)):
+        async with async_engine.connect() as conn:
+            versions = await table_versions(conn, tables)
+        # Cached views on the same request key their entries on these too
+        request.state.table_versions = versions
+
+        key = "|".join([
+            str(request.url.path),
+            str(request.url.query),
+            f"{current_user.id}:{current_user.role}",
+            *(f"{table}:{versions[table][0]}" for table in sorted(tables)),
+        ])
+        etag = '"' + hashlib.sha1(key.encode()).hexdigest()[:20] + '"'
+        timestamps = [updated_at for _, updated_at in versions.values() if updated_at is not None]
+        last_modified = max(timestamps).replace(tzinfo=timezone.utc) if timestamps else None
+
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if last_modified is not None:
+            headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+
+        if_none_match = request.headers.get("if-none-match")
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_none_match is not None:
+            not_modified = _etag_matches(if_none_match, etag)
+        else:
+            not_modified = bool(if_modified_since and last_modified and _not_modified_since(if_modified_since, last_modified))
+        if not_modified:
+            raise HTTPException(status_code=304, headers=headers)
+
+        response.headers.update(headers)
+    return check
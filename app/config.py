@@ -21,6 +21,83 @@ class Settings:
     # Database
     DATABASE_URL: str = os.getenv("DATABASE_URL")
 
+    # Connection pool (per engine, per worker process)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    # Optional cap on connections across all workers; 0 disables it
+    DB_CONNECTION_BUDGET: int = int(os.getenv("DB_CONNECTION_BUDGET", "0"))
+    WEB_CONCURRENCY: int = int(os.getenv("WEB_CONCURRENCY", "1"))
+
+    # bcrypt process pool (0 workers runs hashing in the threadpool instead)
+    PASSWORD_POOL_WORKERS: int = int(os.getenv("PASSWORD_POOL_WORKERS", "2"))
+    PASSWORD_POOL_MAX_PENDING: int = int(os.getenv("PASSWORD_POOL_MAX_PENDING", "64"))
+
+    # Authenticated principal cache (per worker process); changes committed by
+    # other processes are noticed within PRINCIPAL_VERSION_CHECK_INTERVAL seconds
+    PRINCIPAL_CACHE_SIZE: int = int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000"))
+    PRINCIPAL_CACHE_TTL: int = int(os.getenv("PRINCIPAL_CACHE_TTL", "60"))
+    PRINCIPAL_VERSION_CHECK_INTERVAL: float = float(os.getenv("PRINCIPAL_VERSION_CHECK_INTERVAL", "1"))
+
+    # Dashboard summary cache
+    DASHBOARD_CACHE_TTL: int = int(os.getenv("DASHBOARD_CACHE_TTL", "30"))
+
+    # Arrears report cache (per worker process; also dropped on lease/payment writes)
+    REPORT_CACHE_TTL: int = int(os.getenv("REPORT_CACHE_TTL", "300"))
+
+    # Stripe client
+    STRIPE_API_BASE: str = os.getenv("STRIPE_API_BASE")  # e.g. http://localhost:12111 for stripe-mock
+    STRIPE_TIMEOUT: float = float(os.getenv("STRIPE_TIMEOUT", "10"))
+    STRIPE_MAX_RETRIES: int = int(os.getenv("STRIPE_MAX_RETRIES", "2"))
+    STRIPE_BREAKER_THRESHOLD: int = int(os.getenv("STRIPE_BREAKER_THRESHOLD", "5"))
+    STRIPE_BREAKER_RESET: float = float(os.getenv("STRIPE_BREAKER_RESET", "30"))
+
+    # Stripe webhook inbox worker
+    STRIPE_EVENTS_WORKER: bool = os.getenv("STRIPE_EVENTS_WORKER", "true").lower() == "true"
+    STRIPE_EVENTS_BATCH_SIZE: int = int(os.getenv("STRIPE_EVENTS_BATCH_SIZE", "200"))
+    STRIPE_EVENTS_POLL_INTERVAL: float = float(os.getenv("STRIPE_EVENTS_POLL_INTERVAL", "2"))
+
+    # Lease expiry and rent-due scheduler, in-process here or standalone with
+    # python -m app.scheduler; on Postgres an advisory lock per job lets only
+    # one of the processes that enable it run each job at a time
+    SCHEDULER_ENABLED: bool = os.getenv("SCHEDULER_ENABLED", "false").lower() == "true"
+    SCHEDULER_INTERVAL: float = float(os.getenv("SCHEDULER_INTERVAL", "3600"))
+    SCHEDULER_BATCH_SIZE: int = int(os.getenv("SCHEDULER_BATCH_SIZE", "500"))
+    SCHEDULER_BATCH_PAUSE: float = float(os.getenv("SCHEDULER_BATCH_PAUSE", "0.1"))  # seconds between batches
+    SCHEDULER_LOCK_TIMEOUT_MS: int = int(os.getenv("SCHEDULER_LOCK_TIMEOUT_MS", "2000"))
+    RENT_DUE_DAYS_AHEAD: int = int(os.getenv("RENT_DUE_DAYS_AHEAD", "7"))
+
+    # Response cache for reference data; set RESPONSE_CACHE_URL (redis://...) to share it between workers
+    RESPONSE_CACHE_URL: str = os.getenv("RESPONSE_CACHE_URL", "")
+    RESPONSE_CACHE_SIZE: int = int(os.getenv("RESPONSE_CACHE_SIZE", "1024"))
+    RESPONSE_CACHE_TTL: int = int(os.getenv("RESPONSE_CACHE_TTL", "60"))
+
+    # Request timing: slow requests are logged with their slowest statements;
+    # PROFILING_ENABLED lets an admin's "X-Profile: 1" request header return a profile
+    SLOW_REQUEST_MS: float = float(os.getenv("SLOW_REQUEST_MS", "1000"))
+    SLOW_REQUEST_LOG_STATEMENTS: int = int(os.getenv("SLOW_REQUEST_LOG_STATEMENTS", "5"))
+    PROFILE_MAX_STATEMENTS: int = int(os.getenv("PROFILE_MAX_STATEMENTS", "100"))
+    PROFILING_ENABLED: bool = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+    PROFILE_INTERVAL_MS: float = float(os.getenv("PROFILE_INTERVAL_MS", "1"))
+
+    # Test mode: any relationship lazy load that would emit SQL raises instead
+    RAISE_ON_LAZY_LOAD: bool = os.getenv("RAISE_ON_LAZY_LOAD", "false").lower() == "true"
+
+    # Pagination
+    PAGE_SIZE_DEFAULT: int = int(os.getenv("PAGE_SIZE_DEFAULT", "50"))
+    PAGE_SIZE_MAX: int = int(os.getenv("PAGE_SIZE_MAX", "200"))
+
+    # Streaming exports
+    EXPORT_BATCH_SIZE: int = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+    # Bulk imports: rows validated and inserted per transaction
+    BULK_IMPORT_CHUNK_SIZE: int = int(os.getenv("BULK_IMPORT_CHUNK_SIZE", "1000"))
+
+    # Batch status updates (SQLite caps the statement at 500 rows)
+    BATCH_UPDATE_MAX: int = int(os.getenv("BATCH_UPDATE_MAX", "500"))
+
 # Create a settings instance
 settings = Settings()
 
@@ -1,14 +1,137 @@
-from sqlalchemy import create_engine
+import threading
+import time
+from sqlalchemy import create_engine, event, literal, select, union_all, values
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, raiseload, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 import os
 from dotenv import load_dotenv
 
+from app.config import settings
+
 load_dotenv()  # Load environment variables
 
 DATABASE_URL = os.getenv("DATABASE_URL")  # Load from .env
 
-engine = create_engine(DATABASE_URL)
+
+# Queue pools that record how long each checkout waited for a connection.
+# on_wait/on_timeout are optional callbacks, set by app.metrics.
+class _CheckoutTimingMixin:
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.on_wait = None
+        self.on_timeout = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            with self._stats_lock:
+                self.checkout_timeouts += 1
+            if self.on_timeout is not None:
+                self.on_timeout()
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            with self._stats_lock:
+                self.checkouts += 1
+                self.wait_total += waited
+                self.wait_max = max(self.wait_max, waited)
+            if self.on_wait is not None:
+                self.on_wait(waited)
+
+
+class TimedQueuePool(_CheckoutTimingMixin, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(_CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+# Pool arguments from Settings. Each worker process holds a sync and an
+# async engine, so a DB_CONNECTION_BUDGET is split across both of them
+# in every one of the WEB_CONCURRENCY workers.
+def pool_options(url, poolclass) -> dict:
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+
+    pool_size = settings.DB_POOL_SIZE
+    max_overflow = settings.DB_MAX_OVERFLOW
+    if settings.DB_CONNECTION_BUDGET:
+        per_engine = max(1, settings.DB_CONNECTION_BUDGET // (settings.WEB_CONCURRENCY * 2))
+        pool_size = min(pool_size, per_engine)
+        max_overflow = min(max_overflow, per_engine - pool_size)
+
+    return {
+        "poolclass": poolclass,
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+# INSERT that supports on_conflict_do_nothing() on Postgres and SQLite
+def dialect_insert(bind, model):
+    if bind.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(model)
+
+
+# Literal rows usable in FROM, e.g. for UPDATE ... FROM. Postgres gets a
+# VALUES list; SQLite cannot name VALUES columns, so there it is a UNION ALL
+# of one-row SELECTs, of which SQLite allows at most 500 per statement.
+def values_table(bind, name: str, columns, rows):
+    if bind.dialect.name == "postgresql":
+        return values(*columns, name=name).data(rows)
+    return union_all(*(
+        select(*(literal(value, column.type).label(column.name) for column, value in zip(columns, row)))
+        for row in rows
+    )).subquery(name)
+
+
+def pool_stats(engine) -> dict:
+    pool = engine.pool
+    if not isinstance(pool, _CheckoutTimingMixin):
+        return {"pool": type(pool).__name__, "status": pool.status()}
+    return {
+        "pool": type(pool).__name__,
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(0, pool.overflow()),
+        "max_overflow": pool._max_overflow,
+        "timeout": pool.timeout(),
+        "checkouts": pool.checkouts,
+        "checkout_timeouts": pool.checkout_timeouts,
+        "wait_avg_ms": round(pool.wait_total / pool.checkouts * 1000, 3) if pool.checkouts else 0.0,
+        "wait_max_ms": round(pool.wait_max * 1000, 3),
+    }
+
+
+# With RAISE_ON_LAZY_LOAD every ORM SELECT, from sync and async sessions
+# alike, gets raiseload("*"), so a relationship that was not loaded up front
+# (see app/repository.py) raises instead of quietly issuing one query per row.
+@event.listens_for(Session, "do_orm_execute")
+def _raise_on_lazy_load(state):
+    if settings.RAISE_ON_LAZY_LOAD and state.is_select and not state.is_column_load:
+        state.statement = state.statement.options(raiseload("*", sql_only=True))
+
+
+engine = create_engine(DATABASE_URL, **pool_options(DATABASE_URL, TimedQueuePool))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -19,3 +142,31 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# Async stack: same database, reached through an asyncio driver
+ASYNC_DRIVERS = {
+    "postgres": "postgresql+asyncpg",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+def make_async_url(url: str):
+    url = make_url(url)
+    url = url.set(drivername=ASYNC_DRIVERS.get(url.drivername, url.drivername))
+    # asyncpg spells libpq's sslmode as ssl
+    if url.drivername == "postgresql+asyncpg" and "sslmode" in url.query:
+        query = dict(url.query)
+        query["ssl"] = query.pop("sslmode")
+        url = url.set(query=query)
+    return url
+
+async_engine = create_async_engine(
+    make_async_url(DATABASE_URL), **pool_options(DATABASE_URL, TimedAsyncQueuePool)
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,71 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+
+from app.config import settings
+from app.database import SessionLocal
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+def _encode_ndjson(columns, partitions):
+    for rows in partitions:
+        yield "".join(json.dumps(dict(zip(columns, row)), default=_json_default) + "\n" for row in rows)
+
+
+def _encode_csv(columns, partitions):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield buffer.getvalue()
+    for rows in partitions:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(rows)
+        yield buffer.getvalue()
+
+
+# Pull rows through a server-side cursor, one partition at a time.
+# The session is opened here rather than taken from get_db because the
+# body is produced after the request's dependencies have been torn down.
+def _partitions(stmt):
+    with SessionLocal() as db:
+        result = db.execute(stmt.execution_options(yield_per=settings.EXPORT_BATCH_SIZE))
+        for rows in result.partitions():
+            yield rows
+
+
+def check_format(fmt: str):
+    if fmt not in MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail=f"Unsupported export format '{fmt}'")
+
+
+# Stream partitions of row tuples as NDJSON or CSV
+def stream_rows(columns, partitions, filename: str, fmt: str = "ndjson") -> StreamingResponse:
+    check_format(fmt)
+    encoder = _encode_csv if fmt == "csv" else _encode_ndjson
+    return StreamingResponse(
+        encoder(columns, partitions),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'},
+    )
+
+
+# Stream the rows of a column select() as NDJSON or CSV
+def stream_export(stmt, filename: str, fmt: str = "ndjson") -> StreamingResponse:
+    check_format(fmt)
+    columns = [c.name for c in stmt.selected_columns]
+    return stream_rows(columns, _partitions(stmt), filename, fmt)
@@ -30,13 +30,39 @@
 #     return {"message": "Property Management API is running"}
 
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 import app.models  # Ensure all models are imported
-from app.routers import auth, user, properties, units, tenant, lease, payments,tickets
+import app.versioning  # Bump table versions on every write
+from app import utils
+from app.database import async_engine, engine
+from app.config import settings
+from app.metrics import instrument_pool, metrics_response
+from app.profiling import TimingMiddleware, instrument
+from app.stripe_client import stripe_gateway
+from app.scheduler import scheduler
+from app.stripe_events import stripe_event_worker
+from app.routers import auth, user, properties, units, tenant, lease, payments,tickets, system, dashboard, reports, search
+
+
+# ✅ Start background workers; release pooled connections on shutdown
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.STRIPE_EVENTS_WORKER:
+        stripe_event_worker.start()
+    if settings.SCHEDULER_ENABLED:
+        scheduler.start()
+    yield
+    await scheduler.stop()
+    await stripe_event_worker.stop()
+    utils.password_pool.shutdown()
+    await stripe_gateway.aclose()
+    await async_engine.dispose()
 
 # ✅ Initialize FastAPI app
-app = FastAPI()
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # ✅ Allowed origins (Frontend URLs)
 origins = [
@@ -53,6 +79,13 @@ app.add_middleware(
     allow_headers=["*"],  # Allow all headers
 )
 
+# ✅ Per-request latency, query counts and Server-Timing headers
+instrument(engine)
+instrument(async_engine.sync_engine)
+instrument_pool(engine, "sync")
+instrument_pool(async_engine.sync_engine, "async")
+app.add_middleware(TimingMiddleware)
+
 # ✅ Include Routers
 app.include_router(auth.router, prefix="/auth", tags=["Auth"])
 app.include_router(user.router, prefix="/users", tags=["Users"])
@@ -62,6 +95,15 @@ app.include_router(tenant.router, prefix="/tenant", tags=["Tenants"])
 app.include_router(lease.router, prefix="/leases", tags=["Lease"])
 app.include_router(payments.router, prefix="/payments", tags=["Payments"])
 app.include_router(tickets.router,prefix="/tickets",tags=["tickets"])
+app.include_router(system.router, prefix="/system", tags=["System"])
+app.include_router(dashboard.router, prefix="/dashboard", tags=["Dashboard"])
+app.include_router(reports.router, prefix="/reports", tags=["Reports"])
+app.include_router(search.router, prefix="/search", tags=["Search"])
+
+# 📈 Prometheus scrape endpoint
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return metrics_response()
 
 @app.get("/")
 def home():
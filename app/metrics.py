@@ -0,0 +1,105 @@
+import os
+
+from fastapi import Response
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+
+# Under gunicorn set PROMETHEUS_MULTIPROC_DIR (see gunicorn.conf.py): every
+# worker then writes its samples to its own mmap'd files and /metrics sums
+# them, so nothing is shared or locked across processes.
+MULTIPROCESS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by route template and status",
+    ["method", "route", "status"],
+)
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template",
+    ["method", "route"], buckets=LATENCY_BUCKETS,
+)
+HTTP_DB_QUERIES = Histogram(
+    "http_request_db_queries", "SQL statements issued per HTTP request",
+    ["method", "route"], buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+
+DB_POOL_SIZE = Gauge(
+    "db_pool_size", "Configured pool size", ["engine"], multiprocess_mode="livesum",
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out", "Connections currently checked out", ["engine"], multiprocess_mode="livesum",
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection",
+    ["engine"], buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+DB_POOL_TIMEOUTS = Counter(
+    "db_pool_checkout_timeouts_total", "Checkouts that gave up after pool_timeout", ["engine"],
+)
+
+STRIPE_LATENCY = Histogram(
+    "stripe_request_duration_seconds", "Stripe API call latency, per attempt",
+    ["operation", "outcome"], buckets=LATENCY_BUCKETS,
+)
+STRIPE_ERRORS = Counter(
+    "stripe_errors_total", "Failed Stripe API attempts by error kind", ["operation", "kind"],
+)
+
+PASSWORD_SECONDS = Histogram(
+    "password_hash_duration_seconds", "bcrypt time per call, measured in the worker",
+    ["operation"], buckets=(0.01, 0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 1.0, 2.0),
+)
+PASSWORD_POOL_REJECTED = Counter(
+    "password_pool_rejected_total", "Password jobs refused because the pool queue was full",
+)
+
+# Label children resolved once per key. labels() takes the metric's lock,
+# so the request path looks them up here instead; only the event loop
+# thread writes to this dict.
+_http_children = {}
+
+
+def observe_request(method: str, route: str, status: int, seconds: float, queries: int):
+    children = _http_children.get((method, route, status))
+    if children is None:
+        children = _http_children[(method, route, status)] = (
+            HTTP_REQUESTS.labels(method, route, str(status)),
+            HTTP_LATENCY.labels(method, route),
+            HTTP_DB_QUERIES.labels(method, route),
+        )
+    requests, latency, db_queries = children
+    requests.inc()
+    latency.observe(seconds)
+    db_queries.observe(queries)
+
+
+# Pool gauges for an engine (pass async_engine.sync_engine for the async one)
+def instrument_pool(engine, name: str):
+    pool = engine.pool
+    checked_out = DB_POOL_CHECKED_OUT.labels(name)
+    if hasattr(pool, "size"):
+        DB_POOL_SIZE.labels(name).set(pool.size())
+    if hasattr(pool, "on_wait"):
+        pool.on_wait = DB_POOL_CHECKOUT_WAIT.labels(name).observe
+        pool.on_timeout = DB_POOL_TIMEOUTS.labels(name).inc
+    event.listen(engine, "checkout", lambda *args: checked_out.inc())
+    event.listen(engine, "checkin", lambda *args: checked_out.dec())
+
+
+def metrics_response() -> Response:
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
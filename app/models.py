@@ -112,7 +112,7 @@
 
 
 from datetime import datetime
-from sqlalchemy import Column, DateTime, Integer, Numeric, String, Boolean, ForeignKey, Float, Date, func
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, Numeric, String, Boolean, ForeignKey, Float, Date, Text, UniqueConstraint, func, text
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -137,13 +137,16 @@ class Property(Base):
     location = Column(String, nullable=False)
     description = Column(String, nullable=True)
     image_url = Column(String, nullable=True)  # Added image URL field
-    admin_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
+    admin_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), index=True)
 
     admin = relationship("User", back_populates="properties")
     units = relationship("Unit", back_populates="property", cascade="all, delete-orphan")
 
 class Unit(Base):
     __tablename__ = "units"
+    __table_args__ = (
+        Index("ix_units_property_id_status", "property_id", "status"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
@@ -169,10 +172,14 @@ class Tenant(Base):
 
 class Lease(Base):
     __tablename__ = "leases"
+    __table_args__ = (
+        # Scheduler scans: leases in a status, in id order
+        Index("ix_leases_lease_status_id", "lease_status", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    tenant_id = Column(Integer, ForeignKey("tenants.id", ondelete="CASCADE"))
-    unit_id = Column(Integer, ForeignKey("units.id", ondelete="CASCADE"))
+    tenant_id = Column(Integer, ForeignKey("tenants.id", ondelete="CASCADE"), index=True)
+    unit_id = Column(Integer, ForeignKey("units.id", ondelete="CASCADE"), index=True)
     start_date = Column(Date, nullable=False)
     end_date = Column(Date, nullable=False)
     rent_amount = Column(Float, nullable=False)
@@ -187,10 +194,13 @@ class Lease(Base):
 
 class Payment(Base):
     __tablename__ = "payments"
+    __table_args__ = (
+        Index("ix_payments_tenant_id_created_at", "tenant_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     tenant_id = Column(Integer, ForeignKey("tenants.id", ondelete="CASCADE"))
-    lease_id = Column(Integer, ForeignKey("leases.id", ondelete="CASCADE"))
+    lease_id = Column(Integer, ForeignKey("leases.id", ondelete="CASCADE"), index=True)
     amount_paid = Column(Numeric(10, 2), nullable=False)
     payment_status = Column(String, default="pending")
     stripe_payment_intent_id = Column(String, unique=True, nullable=True)
@@ -207,7 +217,7 @@ class SupportTicket(Base):
     __tablename__ = "support_tickets"
 
     id = Column(Integer, primary_key=True, index=True)
-    tenant_id = Column(Integer, ForeignKey("tenants.id", ondelete="CASCADE"))
+    tenant_id = Column(Integer, ForeignKey("tenants.id", ondelete="CASCADE"), index=True)
     subject = Column(String, nullable=False)
     description = Column(String, nullable=False)
     status = Column(String, default="open")  # Open, In Progress, Closed
@@ -217,3 +227,93 @@ class SupportTicket(Base):
 
     def __repr__(self):
         return f"<SupportTicket {self.id}, Tenant {self.tenant_id}, Status {self.status}>"
+
+# Inbox of verified Stripe webhook events, keyed by Stripe's event id
+class StripeEvent(Base):
+    __tablename__ = "stripe_events"
+    __table_args__ = (
+        Index(
+            "ix_stripe_events_pending", "received_at",
+            postgresql_where=text("processed_at IS NULL"),
+            sqlite_where=text("processed_at IS NULL"),
+        ),
+    )
+
+    id = Column(String, primary_key=True)
+    type = Column(String, nullable=False)
+    object_id = Column(String, nullable=True)
+    payload = Column(Text, nullable=False)
+    received_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    processed_at = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<StripeEvent {self.id}, Type {self.type}>"
+
+
+# One row per table, bumped in the same transaction as every write to it.
+# Cheap validators for conditional GETs (see app/versioning.py).
+class TableVersion(Base):
+    __tablename__ = "table_versions"
+
+    table_name = Column(String, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<TableVersion {self.table_name}, Version {self.version}>"
+
+
+# Rent falling due on a lease, created ahead of the due date by the scheduler
+class RentCharge(Base):
+    __tablename__ = "rent_charges"
+    __table_args__ = (
+        UniqueConstraint("lease_id", "due_date", name="uq_rent_charges_lease_id_due_date"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    lease_id = Column(Integer, ForeignKey("leases.id", ondelete="CASCADE"), nullable=False)
+    tenant_id = Column(Integer, ForeignKey("tenants.id", ondelete="CASCADE"), index=True)
+    due_date = Column(Date, nullable=False)
+    amount = Column(Float, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<RentCharge {self.id}, Lease {self.lease_id}, Due {self.due_date}>"
+
+
+# Outgoing messages to users; dedupe_key makes enqueueing idempotent
+class Notification(Base):
+    __tablename__ = "notifications"
+    __table_args__ = (
+        Index(
+            "ix_notifications_pending", "created_at",
+            postgresql_where=text("sent_at IS NULL"),
+            sqlite_where=text("sent_at IS NULL"),
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), index=True)
+    kind = Column(String, nullable=False)
+    message = Column(String, nullable=False)
+    dedupe_key = Column(String, unique=True, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    sent_at = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<Notification {self.id}, Kind {self.kind}, User {self.user_id}>"
+
+
+# Progress of a scheduled job's current run, so a restart resumes after the
+# last committed batch instead of starting over
+class JobCheckpoint(Base):
+    __tablename__ = "job_checkpoints"
+
+    job = Column(String, primary_key=True)
+    run_date = Column(Date, nullable=False)
+    last_id = Column(Integer, nullable=False, default=0)
+    completed = Column(Boolean, nullable=False, default=False)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<JobCheckpoint {self.job}, Run {self.run_date}, Last id {self.last_id}>"
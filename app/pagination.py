@@ -0,0 +1,161 @@
+import base64
+import bisect
+import json
+from datetime import date, datetime
+from typing import Optional
+
+from fastapi import HTTPException, Query
+from sqlalchemy import Date, DateTime, and_, or_
+
+from app.config import settings
+
+
+# Query parameters shared by every list endpoint
+class PageParams:
+    def __init__(
+        self,
+        limit: Optional[int] = Query(None, ge=1, description="Page size (capped by PAGE_SIZE_MAX)"),
+        cursor: Optional[str] = Query(None, description="Opaque next_cursor from the previous page"),
+        sort: str = Query("id", description="Sort key: id or created_at"),
+        order: str = Query("asc", pattern="^(asc|desc)$"),
+    ):
+        self.limit = min(limit or settings.PAGE_SIZE_DEFAULT, settings.PAGE_SIZE_MAX)
+        self.cursor = cursor
+        self.sort = sort
+        self.descending = order == "desc"
+
+
+def encode_cursor(payload: dict) -> str:
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(payload, dict):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return payload
+
+
+def _dump_value(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _load_value(column, value):
+    if value is None:
+        return None
+    try:
+        if isinstance(column.type, DateTime):
+            return datetime.fromisoformat(value)
+        if isinstance(column.type, Date):
+            return date.fromisoformat(value)
+        return int(value)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+# Apply ordering, the keyset predicate and the page limit to a select()
+def keyset(stmt, model, params: PageParams, sortable=("id",)):
+    if params.sort not in sortable:
+        raise HTTPException(status_code=400, detail=f"Cannot sort by '{params.sort}'")
+
+    column = getattr(model, params.sort)
+    columns = [column] if params.sort == "id" else [column, model.id]
+
+    if params.cursor:
+        payload = decode_cursor(params.cursor)
+        if payload.get("s") != params.sort or payload.get("d") != params.descending:
+            raise HTTPException(status_code=400, detail="Cursor does not match sort order")
+        values = [_load_value(column, payload.get("v"))]
+        if len(columns) == 2:
+            values.append(_load_value(model.id, payload.get("id")))
+        # Only the sort column may be NULL; a cursor without an id is malformed
+        if values[-1] is None:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+        # Row-value comparison spelled out so it works on every backend
+        compare = (lambda c, v: c < v) if params.descending else (lambda c, v: c > v)
+        if len(columns) == 1:
+            stmt = stmt.where(compare(columns[0], values[0]))
+        elif values[0] is None:
+            # Past the last non-NULL value: walk the NULL rows by id
+            stmt = stmt.where(columns[0].is_(None), compare(columns[1], values[1]))
+        else:
+            # NULLs sort last in either direction, so they always follow
+            stmt = stmt.where(
+                or_(
+                    compare(columns[0], values[0]),
+                    and_(columns[0] == values[0], compare(columns[1], values[1])),
+                    columns[0].is_(None),
+                )
+            )
+
+    # Nullable sort columns (created_at) put NULLs last on every backend,
+    # matching the predicate above; id is never NULL
+    order_by = [c.desc() if params.descending else c.asc() for c in columns]
+    if len(order_by) == 2:
+        order_by[0] = order_by[0].nulls_last()
+    return stmt.order_by(*order_by).limit(params.limit + 1)
+
+
+# Trim the look-ahead row and build the response envelope
+def page_of(rows, params: PageParams) -> dict:
+    rows = list(rows)
+    next_cursor = None
+    if len(rows) > params.limit:
+        rows = rows[:params.limit]
+        last = rows[-1]
+        payload = {"s": params.sort, "d": params.descending, "v": _dump_value(getattr(last, params.sort))}
+        if params.sort != "id":
+            payload["id"] = last.id
+        next_cursor = encode_cursor(payload)
+    return {"items": rows, "next_cursor": next_cursor}
+
+
+def paginate(db, stmt, model, params: PageParams, sortable=("id",)) -> dict:
+    rows = db.execute(keyset(stmt, model, params, sortable)).scalars().all()
+    return page_of(rows, params)
+
+
+async def apaginate(db, stmt, model, params: PageParams, sortable=("id",)) -> dict:
+    result = await db.execute(keyset(stmt, model, params, sortable))
+    return page_of(result.scalars().all(), params)
+
+
+# Like paginate(), for a select() of columns; items are Row tuples
+def paginate_rows(db, stmt, model, params: PageParams, sortable=("id",)) -> dict:
+    return page_of(db.execute(keyset(stmt, model, params, sortable)).all(), params)
+
+
+# Keyset pagination over an in-memory list of dicts with numeric sort keys
+def paginate_list(rows, params: PageParams, sortable=("id",)) -> dict:
+    if params.sort not in sortable:
+        raise HTTPException(status_code=400, detail=f"Cannot sort by '{params.sort}'")
+
+    sign = -1 if params.descending else 1
+    key = lambda row: (sign * row[params.sort], sign * row["id"])  # noqa: E731
+    rows = sorted(rows, key=key)
+
+    start = 0
+    if params.cursor:
+        payload = decode_cursor(params.cursor)
+        if payload.get("s") != params.sort or payload.get("d") != params.descending:
+            raise HTTPException(status_code=400, detail="Cursor does not match sort order")
+        try:
+            after = (sign * float(payload["v"]), sign * int(payload["id"]))
+        except (KeyError, TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        start = bisect.bisect_right(rows, after, key=key)
+
+    page = rows[start:start + params.limit]
+    next_cursor = None
+    if start + params.limit < len(rows):
+        last = page[-1]
+        next_cursor = encode_cursor({"s": params.sort, "d": params.descending, "v": last[params.sort], "id": last["id"]})
+    return {"items": page, "next_cursor": next_cursor}
@@ -0,0 +1,54 @@
+from sqlalchemy import false, select
+
+from app.models import Lease, Payment, Property, SupportTicket, Tenant
+
+
+# Row-level read policies: for each role, a SQL predicate on the model
+# selecting the rows a principal may see. Scoped queries carry the
+# predicate themselves, so rows outside the caller's scope are never
+# fetched, and a lookup by id is one query on the primary key. A row the
+# caller may not see is indistinguishable from a missing one (a 404).
+class Policy:
+    def __init__(self, model, **roles):
+        self.model = model
+        self.roles = roles
+
+    # None means every row; roles without a rule see nothing
+    def predicate(self, principal):
+        rule = self.roles.get(principal.role)
+        if rule is None:
+            return false()
+        return rule(principal)
+
+    def scope(self, stmt, principal):
+        predicate = self.predicate(principal)
+        return stmt if predicate is None else stmt.where(predicate)
+
+    def get(self, db, principal, id: int, stmt=None):
+        stmt = select(self.model) if stmt is None else stmt
+        return db.scalars(self.scope(stmt.where(self.model.id == id), principal)).first()
+
+    async def aget(self, db, principal, id: int, stmt=None):
+        stmt = select(self.model) if stmt is None else stmt
+        return (await db.scalars(self.scope(stmt.where(self.model.id == id), principal))).first()
+
+
+def unrestricted(principal):
+    return None
+
+
+# Rows belonging to the principal's tenant profile; nothing without one
+def own_tenant(column):
+    def rule(principal):
+        if principal.tenant_id is None:
+            return false()
+        return column == principal.tenant_id
+    return rule
+
+
+# Each predicate is on an indexed column (see app/models.py)
+properties = Policy(Property, Admin=unrestricted, Tenant=lambda principal: Property.admin_id == principal.id)
+tenants = Policy(Tenant, Admin=unrestricted, Tenant=lambda principal: Tenant.user_id == principal.id)
+leases = Policy(Lease, Admin=unrestricted, Tenant=own_tenant(Lease.tenant_id))
+payments = Policy(Payment, Admin=unrestricted, Tenant=own_tenant(Payment.tenant_id))
+tickets = Policy(SupportTicket, Admin=unrestricted, Tenant=own_tenant(SupportTicket.tenant_id))
@@ -0,0 +1,282 @@
+import asyncio
+import bisect
+import contextvars
+import logging
+import os
+import sys
+import threading
+import time
+
+from fastapi import HTTPException
+from sqlalchemy import event
+from starlette.concurrency import run_in_threadpool
+
+from app import metrics
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Latency histogram bucket upper bounds, in milliseconds
+BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, float("inf"))
+
+
+# Queries and DB time of the request being handled. Sync endpoints run in
+# the threadpool with a copy of the context, so they update the same object.
+class RequestStats:
+    __slots__ = ("queries", "db_time", "statements")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.statements = []
+
+    def record(self, statement: str, elapsed: float):
+        self.queries += 1
+        self.db_time += elapsed
+        if len(self.statements) < settings.PROFILE_MAX_STATEMENTS:
+            self.statements.append((elapsed, statement))
+
+
+current_request = contextvars.ContextVar("current_request", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    stats = current_request.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+
+
+# Count queries and DB time on an engine (pass async_engine.sync_engine for the async one)
+def instrument(engine):
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# Per route latency histogram, updated from the event loop only
+class RouteTimings:
+    def __init__(self):
+        self.routes = {}
+
+    def observe(self, key, elapsed_ms: float, stats: RequestStats):
+        entry = self.routes.get(key)
+        if entry is None:
+            entry = self.routes[key] = {
+                "count": 0, "total_ms": 0.0, "max_ms": 0.0, "queries": 0, "db_ms": 0.0,
+                "buckets": [0] * len(BUCKETS_MS),
+            }
+        entry["count"] += 1
+        entry["total_ms"] += elapsed_ms
+        entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+        entry["queries"] += stats.queries
+        entry["db_ms"] += stats.db_time * 1000
+        entry["buckets"][bisect.bisect_left(BUCKETS_MS, elapsed_ms)] += 1
+
+    def snapshot(self) -> list:
+        report = []
+        for (method, route, status), entry in sorted(self.routes.items()):
+            count = entry["count"]
+            report.append({
+                "method": method,
+                "route": route,
+                "status": status,
+                "count": count,
+                "avg_ms": round(entry["total_ms"] / count, 3),
+                "max_ms": round(entry["max_ms"], 3),
+                "avg_queries": round(entry["queries"] / count, 2),
+                "avg_db_ms": round(entry["db_ms"] / count, 3),
+                "buckets": {("+Inf" if le == float("inf") else le): n for le, n in zip(BUCKETS_MS, entry["buckets"])},
+            })
+        return report
+
+
+route_timings = RouteTimings()
+
+
+def route_of(scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", "unmatched")
+
+
+def server_timing(elapsed: float, stats: RequestStats) -> str:
+    return f'app;dur={elapsed * 1000:.1f}, db;dur={stats.db_time * 1000:.1f};desc="{stats.queries} queries"'
+
+
+def _log_slow(method, route, status, elapsed, stats):
+    slowest = sorted(stats.statements, reverse=True)[:settings.SLOW_REQUEST_LOG_STATEMENTS]
+    logger.warning(
+        "Slow request %s %s -> %s in %.1fms (%d queries, %.1fms in DB)%s",
+        method, route, status, elapsed * 1000, stats.queries, stats.db_time * 1000,
+        "".join(f"\n  {seconds * 1000:.1f}ms {' '.join(sql.split())}" for seconds, sql in slowest),
+    )
+
+
+# Sampling profiler for the thread running a request's endpoint. Sync
+# endpoints run in the threadpool and async ones on the event loop, so
+# rather than profiling the thread that starts it, a background thread
+# samples every thread whose stack is inside the endpoint function
+# (scope["endpoint"], set once the request is routed) and keeps the frames
+# from the endpoint down. Dependencies run before the endpoint and are not
+# sampled; time spent awaiting is not on any stack, but the DB part of it
+# is in the query list.
+class EndpointSampler:
+    def __init__(self, scope, interval: float):
+        self.scope = scope
+        self.interval = interval
+        self.samples = 0
+        self.inclusive = {}
+        self.own = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            code = getattr(self.scope.get("endpoint"), "__code__", None)
+            if code is None:
+                continue
+            for ident, frame in sys._current_frames().items():
+                if ident != me:
+                    self._sample(frame, code)
+
+    def _sample(self, frame, code):
+        stack = []
+        while frame is not None:
+            stack.append(frame.f_code)
+            if frame.f_code is code:
+                break
+            frame = frame.f_back
+        else:
+            return  # this thread is not running the endpoint
+        self.samples += 1
+        self.own[stack[0]] = self.own.get(stack[0], 0) + 1
+        for frame_code in set(stack):
+            self.inclusive[frame_code] = self.inclusive.get(frame_code, 0) + 1
+
+    def output_text(self, limit: int = 40) -> str:
+        if not self.samples:
+            return "No samples: the endpoint finished within one sampling interval\n"
+        lines = [f"{self.samples} samples every {self.interval * 1000:g}ms\n",
+                 f"{'total%':>7} {'self%':>7}  function"]
+        for code, count in sorted(self.inclusive.items(), key=lambda item: -item[1])[:limit]:
+            location = os.path.relpath(code.co_filename) if code.co_filename.startswith(os.getcwd()) else code.co_filename
+            lines.append(f"{count * 100 / self.samples:7.1f} {self.own.get(code, 0) * 100 / self.samples:7.1f}"
+                         f"  {code.co_name} ({location}:{code.co_firstlineno})")
+        return "\n".join(lines) + "\n"
+
+
+# One profiled request at a time: concurrent ones would sample each other
+_profile_lock = asyncio.Lock()
+
+
+def _bearer_token(scope):
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            return token if scheme.lower() == "bearer" else None
+    return None
+
+
+# Profiles replace the response body, so only admins may ask for one
+def _is_admin(token) -> bool:
+    from app.database import SessionLocal
+    from app.routers.auth import principal_from_token
+
+    with SessionLocal() as db:
+        try:
+            return principal_from_token(token, db).role == "Admin"
+        except HTTPException:
+            return False
+
+
+# ASGI middleware: per-request query counting, a Server-Timing header,
+# per-route histograms and a slow-request log. With PROFILING_ENABLED, an
+# admin's request carrying "X-Profile: 1" gets its profile back instead of
+# its body; the header is ignored on anyone else's.
+class TimingMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if settings.PROFILING_ENABLED and (b"x-profile", b"1") in scope["headers"]:
+            token = _bearer_token(scope)
+            if token and await run_in_threadpool(_is_admin, token):
+                async with _profile_lock:
+                    await self._profile(scope, receive, send)
+                return
+
+        stats = RequestStats()
+        token = current_request.set(stats)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", server_timing(time.perf_counter() - start, stats).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_request.reset(token)
+            elapsed = time.perf_counter() - start
+            route = route_of(scope)
+            route_timings.observe((scope["method"], route, status), elapsed * 1000, stats)
+            metrics.observe_request(scope["method"], route, status, elapsed, stats.queries)
+            if elapsed * 1000 >= settings.SLOW_REQUEST_MS:
+                _log_slow(scope["method"], route, status, elapsed, stats)
+
+    async def _profile(self, scope, receive, send):
+        stats = RequestStats()
+        token = current_request.set(stats)
+        profiler = EndpointSampler(scope, settings.PROFILE_INTERVAL_MS / 1000)
+        status = 500
+
+        async def discard(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+
+        start = time.perf_counter()
+        profiler.start()
+        try:
+            await self.app(scope, receive, discard)
+        finally:
+            profiler.stop()
+            current_request.reset(token)
+        elapsed = time.perf_counter() - start
+
+        queries = "".join(f"{seconds * 1000:9.1f}ms  {' '.join(sql.split())}\n" for seconds, sql in stats.statements)
+        body = (
+            f"{scope['method']} {route_of(scope)} -> {status} in {elapsed * 1000:.1f}ms, "
+            f"{stats.queries} queries, {stats.db_time * 1000:.1f}ms in DB\n\n{queries}\n{profiler.output_text()}"
+        ).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"text/plain; charset=utf-8"),
+                (b"content-length", str(len(body)).encode()),
+                (b"server-timing", server_timing(elapsed, stats).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,171 @@
+import calendar
+from datetime import date, timedelta
+
+from fastapi import HTTPException
+from sqlalchemy import func, select
+
+from app.cache import TTLCache
+from app.config import settings
+from app.models import Lease, Payment, Property, Tenant, Unit
+from app.versioning import commit_listeners
+
+AGING_BUCKETS = ("current", "days_31_60", "days_61_90", "days_over_90")
+COLUMNS = ("id", "name", "leases", "charged", "paid", "balance") + AGING_BUCKETS
+
+# Report rows can be rolled up by any of these; the value is the position
+# of the grouping id in a lease tuple and the column holding its name
+GROUPS = {
+    "lease": (0, None),
+    "tenant": (1, Tenant.full_name),
+    "unit": (2, Unit.name),
+    "property": (3, Property.name),
+}
+
+# Tables the report reads; a committed write to any of them drops it
+SOURCE_TABLES = {Lease.__tablename__, Payment.__tablename__, Unit.__tablename__}
+
+
+def add_months(start: date, months: int) -> date:
+    month = start.month - 1 + months
+    year = start.year + month // 12
+    month = month % 12 + 1
+    return date(year, month, min(start.day, calendar.monthrange(year, month)[1]))
+
+
+# Monthly charges due from `start` up to and including `cutoff`: one on the
+# start date, then one on the same day of each later month (clamped to the
+# month's last day). Worked out directly instead of by walking the months.
+def charges_due(start: date, cutoff: date) -> int:
+    if cutoff < start:
+        return 0
+    months = (cutoff.year - start.year) * 12 + cutoff.month - start.month
+    if cutoff.day < min(start.day, calendar.monthrange(cutoff.year, cutoff.month)[1]):
+        months -= 1
+    return months + 1
+
+
+# Split an outstanding balance into aging buckets. Payments settle the
+# oldest charges first, so what is owed is the most recent charges; only
+# the charges younger than 90 days are dated, the rest is over 90.
+def aging(start: date, rent: float, count: int, balance: float, as_of: date) -> list:
+    buckets = [0.0, 0.0, 0.0, 0.0]
+    k = count - 1
+    while balance > 0 and k >= 0:
+        days = (as_of - add_months(start, k)).days
+        if days > 90:
+            buckets[3] += balance
+            break
+        amount = min(rent, balance)
+        buckets[0 if days <= 30 else 1 if days <= 60 else 2] += amount
+        balance -= amount
+        k -= 1
+    return buckets
+
+
+# Balances for every lease as of a date, rolled up on demand. Expected
+# rent comes from each lease's schedule and payments are summed in SQL,
+# so the work is one pass over the leases whatever the payment history.
+class ArrearsReport:
+    def __init__(self, as_of: date, leases: list):
+        self.as_of = as_of
+        # (lease_id, tenant_id, unit_id, property_id, charged, paid, balance, *aging)
+        self.leases = leases
+        self._groups = {}
+
+    @classmethod
+    def build(cls, db, as_of: date):
+        paid = dict(db.execute(
+            select(Payment.lease_id, func.sum(Payment.amount_paid))
+            .where(
+                Payment.payment_status == "succeeded",
+                Payment.lease_id.is_not(None),
+                Payment.created_at < as_of + timedelta(days=1),
+            )
+            .group_by(Payment.lease_id)
+        ).all())
+
+        result = db.execute(
+            select(Lease.id, Lease.tenant_id, Lease.unit_id, Unit.property_id,
+                   Lease.start_date, Lease.end_date, Lease.rent_amount)
+            .outerjoin(Unit, Lease.unit_id == Unit.id)
+            .execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+        )
+        leases = []
+        for lease_id, tenant_id, unit_id, property_id, start, end, rent in result:
+            # Rent falls due on schedule days before the end date
+            count = charges_due(start, min(as_of, end - timedelta(days=1)))
+            lease_paid = float(paid.get(lease_id) or 0)
+            if not count and not lease_paid:
+                continue
+            charged = count * rent
+            balance = charged - lease_paid
+            leases.append((lease_id, tenant_id, unit_id, property_id, charged, lease_paid, balance,
+                           *aging(start, rent, count, balance, as_of)))
+        return cls(as_of, leases)
+
+    # One row per lease, tenant, unit or property
+    def rows(self, group: str) -> list:
+        rows = self._groups.get(group)
+        if rows is not None:
+            return rows
+        position = GROUPS[group][0]
+        members = {}
+        for lease in self.leases:
+            members.setdefault(lease[position], []).append(lease)
+        rows = []
+        for key, leases in members.items():
+            if key is None:
+                continue
+            if len(leases) == 1:
+                amounts = leases[0][4:]
+            else:
+                # zip(*leases) turns the group's tuples into columns
+                amounts = [sum(column) for column in list(zip(*leases))[4:]]
+            rows.append(dict(zip(COLUMNS, (key, None, len(leases), *[round(value, 2) for value in amounts]))))
+        self._groups[group] = rows
+        return rows
+
+
+# Display names for report rows; every name in the table when ids is None
+def names(db, group: str, ids=None) -> dict:
+    column = GROUPS[group][1]
+    if column is None or ids == []:
+        return {}
+    model = column.class_
+    stmt = select(model.id, column)
+    if ids is not None:
+        stmt = stmt.where(model.id.in_(ids))
+    return dict(db.execute(stmt).all())
+
+
+def parse_group(group: str) -> str:
+    if group not in GROUPS:
+        raise HTTPException(status_code=400, detail=f"group_by must be one of: {', '.join(GROUPS)}")
+    return group
+
+
+# Built reports per as_of date, dropped whenever leases, payments or units change
+report_cache = TTLCache(maxsize=8, ttl=settings.REPORT_CACHE_TTL)
+_generation = 0
+
+
+def _invalidate(tables):
+    global _generation
+    if SOURCE_TABLES & set(tables):
+        _generation += 1
+        report_cache.clear()
+
+
+commit_listeners.append(_invalidate)
+
+
+def arrears_report(db, as_of: date = None) -> ArrearsReport:
+    as_of = as_of or date.today()
+    report = report_cache.get(as_of)
+    if report is None:
+        generation = _generation
+        report = ArrearsReport.build(db, as_of)
+        # Not cached if a write committed while it was being built
+        if generation == _generation:
+            report_cache.set(as_of, report)
+    return report
@@ -0,0 +1,48 @@
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload, raiseload, selectinload
+
+from app.models import Lease, Property, Tenant, Unit
+
+
+# Loader strategies declared per use case, so a query fetches every
+# relationship its response walks in a fixed number of round trips. Each
+# strategy ends with raiseload("*"): anything not listed raises rather
+# than lazy loading row by row.
+class Repository:
+    def __init__(self, model, **strategies):
+        self.model = model
+        self.strategies = strategies
+
+    def select(self, strategy: str = None):
+        stmt = select(self.model)
+        if strategy is not None:
+            stmt = stmt.options(*self.strategies[strategy], raiseload("*"))
+        return stmt
+
+    def get(self, db, id: int, strategy: str = None):
+        return db.scalars(self.select(strategy).where(self.model.id == id)).first()
+
+    async def aget(self, db, id: int, strategy: str = None):
+        return (await db.scalars(self.select(strategy).where(self.model.id == id))).first()
+
+
+properties = Repository(
+    Property,
+    # Property -> units -> active lease -> tenant: three SELECTs in total
+    detail=[
+        selectinload(Property.units)
+        .selectinload(Unit.lease.and_(Lease.lease_status == "Active"))
+        .joinedload(Lease.tenant),
+    ],
+)
+
+tenants = Repository(
+    Tenant,
+    # Tenant -> leases -> payments: three SELECTs in total
+    leases=[selectinload(Tenant.leases).selectinload(Lease.payments)],
+)
+
+leases = Repository(
+    Lease,
+    with_unit=[joinedload(Lease.unit).joinedload(Unit.property)],
+)
@@ -0,0 +1,118 @@
+import threading
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+
+from app.cache import LocalBackend, SharedBackend
+from app.config import settings
+from app.database import async_engine, engine
+from app.serializers import json_response
+from app.versioning import table_versions, table_versions_sync
+
+
+# Cache of serialized GET responses. Keys carry the version counter of
+# every table the response reads (app/versioning.py), which every process
+# bumps in the transaction that writes the table, so after any committed
+# write the next read misses and rebuilds, whichever worker it lands on.
+class ResponseCache:
+    def __init__(self, backend):
+        self.backend = backend
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _count(self, body):
+        with self._lock:
+            if body is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return body
+
+    def get(self, key):
+        return self._count(self.backend.get(key))
+
+    async def aget(self, key):
+        return self._count(await self.backend.aget(key))
+
+    def set(self, key, body: bytes):
+        self.backend.set(key, body)
+
+    async def aset(self, key, body: bytes):
+        await self.backend.aset(key, body)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.backend.name,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            **self.backend.stats(),
+        }
+
+
+def make_backend():
+    if settings.RESPONSE_CACHE_URL:
+        return SharedBackend.from_url(settings.RESPONSE_CACHE_URL, settings.RESPONSE_CACHE_TTL)
+    return LocalBackend(settings.RESPONSE_CACHE_SIZE, settings.RESPONSE_CACHE_TTL)
+
+
+response_cache = ResponseCache(make_backend())
+
+
+# One cached endpoint: the response schema and the tables it reads.
+#
+#     key, body = view.lookup(request, scope)          # await view.alookup(...) when async
+#     if body is None:
+#         body = view.store(key, <build the response content>)   # await view.astore(...)
+#     return view.respond(body, response)
+class CachedView:
+    def __init__(self, schema, *tables, cache: ResponseCache = None):
+        self.tables = sorted(tables)
+        self.adapter = TypeAdapter(schema)
+        self.cache = cache or response_cache
+
+    # Versions read by conditional() for this request, when it ran
+    def _known_versions(self, request: Request):
+        versions = getattr(request.state, "table_versions", None)
+        if versions is not None and all(table in versions for table in self.tables):
+            return versions
+        return None
+
+    # Route, query string, caller scope and table versions
+    def _key(self, request: Request, scope: str, versions: dict) -> str:
+        tables = ",".join(f"{table}={versions[table][0]}" for table in self.tables)
+        return f"{request.url.path}?{request.url.query}|{scope}|{tables}"
+
+    def lookup(self, request: Request, scope: str):
+        versions = self._known_versions(request)
+        if versions is None:
+            with engine.connect() as conn:
+                versions = table_versions_sync(conn, self.tables)
+        key = self._key(request, scope, versions)
+        return key, self.cache.get(key)
+
+    async def alookup(self, request: Request, scope: str):
+        versions = self._known_versions(request)
+        if versions is None:
+            async with async_engine.connect() as conn:
+                versions = await table_versions(conn, self.tables)
+        key = self._key(request, scope, versions)
+        return key, await self.cache.aget(key)
+
+    def _dump(self, content) -> bytes:
+        return self.adapter.dump_json(self.adapter.validate_python(content, from_attributes=True))
+
+    def store(self, key: str, content) -> bytes:
+        body = self._dump(content)
+        self.cache.set(key, body)
+        return body
+
+    async def astore(self, key: str, content) -> bytes:
+        body = self._dump(content)
+        await self.cache.aset(key, body)
+        return body
+
+    def respond(self, body: bytes, response: Response = None) -> Response:
+        return json_response(body, response)
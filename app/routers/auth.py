@@ -1,9 +1,19 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import case, event, exists, func, insert, inspect, literal, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
 from datetime import timedelta
 from jose import JWTError, jwt
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from app import models, schemas, database, utils
+from app.cache import TTLCache
+from app.config import settings
+from app.versioning import table_versions_sync
 
 router = APIRouter()
 
@@ -18,65 +28,94 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 30
 def get_user_by_email(db: Session, email: str):
     return db.query(models.User).filter(models.User.email == email).first()
 
-# Function to check if the first user (for Admin role)
-def is_first_user(db: Session):
-    return db.query(models.User).count() == 0
+# The first user becomes Admin. The role is decided by the INSERT itself
+# (INSERT ... SELECT with an EXISTS on users), so it sees every committed
+# user. Two sign-ups on an empty database could still both see none on
+# Postgres, so while the table looks empty the transaction first takes an
+# advisory lock that serializes them; SQLite serializes writers anyway.
+# Once users exist the lock is never taken again.
+BOOTSTRAP_LOCK = 0x7573657273  # "users"
+
+def first_user_role():
+    return case((exists().where(models.User.id.is_not(None)), "Tenant"), else_="Admin")
+
+async def lock_if_first_user(db: AsyncSession):
+    if db.bind.dialect.name != "postgresql":
+        return
+    if not await db.scalar(select(exists().where(models.User.id.is_not(None)))):
+        await db.execute(select(func.pg_advisory_xact_lock(BOOTSTRAP_LOCK)))
+
+# Whether an IntegrityError is the unique index on users.email
+def is_duplicate_email(error: IntegrityError) -> bool:
+    message = str(error.orig).lower()
+    return ("unique" in message or "duplicate" in message) and "email" in message
 
 # Function to authenticate a user by checking their email and password
-def authenticate_user(db: Session, email: str, password: str):
-    user = get_user_by_email(db, email)
-    if not user or not utils.verify_password(password, user.password):
+async def authenticate_user(db: AsyncSession, email: str, password: str):
+    user = await db.scalar(select(models.User).where(models.User.email == email))
+    if not user or not await verify_password(password, user.password):
         return None
     return user
 
-# Route to register a new user
+# bcrypt runs in the password pool; shed load with a 503 when it is saturated
+async def hash_password(password: str):
+    try:
+        return await utils.hash_password_async(password)
+    except utils.PasswordPoolBusy:
+        raise HTTPException(status_code=503, detail="Server busy, try again", headers={"Retry-After": "1"})
+
+async def verify_password(plain_password: str, hashed_password: str):
+    try:
+        return await utils.verify_password_async(plain_password, hashed_password)
+    except utils.PasswordPoolBusy:
+        raise HTTPException(status_code=503, detail="Server busy, try again", headers={"Retry-After": "1"})
+
+# Route to register a new user. The user and, for tenants, their tenant
+# profile are inserted in one transaction with a single commit; the new id
+# comes back from INSERT ... RETURNING, so nothing is read back afterwards.
 @router.post("/register", response_model=schemas.UserResponse)
-def register_user(user_data: schemas.UserCreate, db: Session = Depends(database.get_db)):
-    # Check if email already exists
-    existing_user = get_user_by_email(db, user_data.email)
-    if existing_user:
-        raise HTTPException(status_code=400, detail="Email already registered")
-    
+async def register_user(user_data: schemas.UserCreate, db: AsyncSession = Depends(database.get_async_db)):
+    # Hash before opening the transaction so no write is held across bcrypt
+    hashed_password = await hash_password(user_data.password)
+
     # Assign role: Admin for the first user, Tenant for others
-    role = "Admin" if is_first_user(db) else "Tenant"
-    
-    # Hash the user's password
-    hashed_password = utils.hash_password(user_data.password)
-    
-    # Create the new user object
-    new_user = models.User(
-        full_name=user_data.full_name,
-        email=user_data.email,
-        password=hashed_password,
-        role=role,  # Set role based on first user check
-        is_active=True
-    )
-    
-    # Add user to database
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
-    
+    await lock_if_first_user(db)
+
+    # The unique index on email rejects a duplicate; no lookup beforehand
+    try:
+        user_id, role = (await db.execute(
+            insert(models.User)
+            .from_select(
+                ["full_name", "email", "password", "role", "is_active"],
+                select(literal(user_data.full_name), literal(user_data.email), literal(hashed_password),
+                       first_user_role(), literal(True)),
+            )
+            .returning(models.User.id, models.User.role)
+        )).one()
+    except IntegrityError as e:
+        await db.rollback()
+        if not is_duplicate_email(e):
+            raise
+        raise HTTPException(status_code=400, detail="Email already registered")
+
     # ✅ If the user is a Tenant, also create a Tenant entry
     if role == "Tenant":
-        new_tenant = models.Tenant(
-            user_id=new_user.id,  # Link Tenant to the User
-            full_name=new_user.full_name,
-            email=new_user.email,
-            phone_number=user_data.phone_number  # Ensure `phone_number` is added to UserCreate schema
-        )
-        db.add(new_tenant)
-        db.commit()
-        db.refresh(new_tenant)
+        await db.execute(insert(models.Tenant).values(
+            user_id=user_id,  # Link Tenant to the User
+            full_name=user_data.full_name,
+            email=user_data.email,
+            phone_number=user_data.phone_number
+        ))
+    await db.commit()
 
-    return new_user
+    return {"id": user_id, "full_name": user_data.full_name, "email": user_data.email, "role": role}
 
 
 # Route to login and generate an access token
 @router.post("/token", response_model=schemas.Token)
-def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(database.get_db)):
+async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(database.get_async_db)):
     # Authenticate the user
-    user = authenticate_user(db, form_data.username, form_data.password)
+    user = await authenticate_user(db, form_data.username, form_data.password)
     
     if not user:
         raise HTTPException(
@@ -91,8 +130,100 @@ def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db:
     
     return {"access_token": access_token, "token_type": "bearer","id": user.id,"full_name":user.full_name}
 
-# Helper function to get the current logged-in user based on the token
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(database.get_db)):
+# Snapshot of the authenticated user's row, detached from any session
+@dataclass(frozen=True)
+class Principal:
+    id: int
+    full_name: str
+    email: str
+    role: str
+    is_active: bool
+    tenant_id: Optional[int] = None  # the user's tenant profile, if they registered one
+
+    @classmethod
+    def from_user(cls, user: models.User, tenant_id: Optional[int] = None):
+        return cls(id=user.id, full_name=user.full_name, email=user.email, role=user.role,
+                   is_active=user.is_active, tenant_id=tenant_id)
+
+# Principals keyed on user id. Within a process, entries are dropped as
+# soon as a change to the user or their tenant link commits. Other
+# processes notice through the users and tenants version counters, which
+# are compared at most every PRINCIPAL_VERSION_CHECK_INTERVAL seconds; a
+# change there drops every entry, bounding how long a demoted user or a
+# new tenant link can go unseen.
+principal_cache = TTLCache(settings.PRINCIPAL_CACHE_SIZE, settings.PRINCIPAL_CACHE_TTL)
+PRINCIPAL_TABLES = (models.User.__tablename__, models.Tenant.__tablename__)
+_principal_versions = None
+_versions_checked_at = 0.0
+_versions_lock = threading.Lock()
+
+def invalidate_principal(user_id: int):
+    principal_cache.delete(user_id)
+
+def _check_principal_versions(db: Session):
+    global _principal_versions, _versions_checked_at
+    now = time.monotonic()
+    if now - _versions_checked_at < settings.PRINCIPAL_VERSION_CHECK_INTERVAL:
+        return
+    versions = table_versions_sync(db.connection(), PRINCIPAL_TABLES)
+    current = tuple(versions[table][0] for table in PRINCIPAL_TABLES)
+    with _versions_lock:
+        if _principal_versions is not None and current != _principal_versions:
+            principal_cache.clear()
+        _principal_versions, _versions_checked_at = current, now
+
+# Users whose tenant link a transaction changed, dropped from the cache
+# once it commits. Statements that change tenants without saying whose
+# (a bulk UPDATE or DELETE) drop every entry.
+def _tenant_links(session) -> set:
+    return session.info.setdefault("principal_user_ids", set())
+
+def _record_tenant_link(mapper, connection, target):
+    session = object_session(target)
+    if session is None:
+        return
+    links = _tenant_links(session)
+    history = inspect(target).attrs.user_id.history
+    links.update(user_id for user_id in (*history.deleted, target.user_id) if user_id is not None)
+
+for _event in ("after_insert", "after_update", "after_delete"):
+    event.listen(models.Tenant, _event, _record_tenant_link)
+
+@event.listens_for(Session, "do_orm_execute")
+def _record_tenant_statement(orm_execute_state):
+    state = orm_execute_state
+    if not (state.is_insert or state.is_update or state.is_delete):
+        return
+    if state.statement.table.name != models.Tenant.__tablename__:
+        return
+    if not state.is_insert:
+        _tenant_links(state.session).add(None)
+        return
+    params = state.parameters or state.statement.compile().params
+    for row in params if isinstance(params, list) else [params]:
+        if row.get("user_id") is not None:
+            _tenant_links(state.session).add(row["user_id"])
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_tenant_links(session):
+    user_ids = session.info.pop("principal_user_ids", None)
+    if not user_ids:
+        return
+    if None in user_ids:
+        principal_cache.clear()
+        return
+    for user_id in user_ids:
+        principal_cache.delete(user_id)
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_tenant_links(session, transaction):
+    if transaction.parent is None and not transaction.nested:
+        session.info.pop("principal_user_ids", None)
+
+# Resolve a bearer token to its principal, or raise 401. A cached
+# principal answers without touching the database; the users table is
+# only read on a cache miss.
+def principal_from_token(token: str, db: Session):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -103,23 +234,47 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
         # Decode the JWT token
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         email: str = payload.get("sub")
+        user_id = payload.get("id")
         
-        if email is None:
+        if email is None or user_id is None:
             raise credentials_exception
     except JWTError:
         raise credentials_exception
     
-    # Fetch user from the database
-    user = get_user_by_email(db, email)
-    
-    if user is None:
+    _check_principal_versions(db)
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        # Fetch the user and their tenant id together
+        row = db.execute(
+            select(models.User, models.Tenant.id)
+            .outerjoin(models.Tenant, models.Tenant.user_id == models.User.id)
+            .where(models.User.id == user_id)
+        ).first()
+        if row is None:
+            raise credentials_exception
+        principal = Principal.from_user(*row)
+        principal_cache.set(user_id, principal)
+
+    # Tokens minted before an email change no longer match the user
+    if principal.email != email:
         raise credentials_exception
     
-    return user
+    return principal
+
+# Helper function to get the current logged-in user based on the token
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(database.get_db)):
+    return principal_from_token(token, db)
+
+# The current user's tenant profile, resolved along with the user; handlers
+# read current_user.tenant_id instead of querying tenants again
+def get_current_tenant(current_user: Principal = Depends(get_current_user)):
+    if current_user.tenant_id is None:
+        raise HTTPException(status_code=404, detail="Tenant not found")
+    return current_user
 
 # Role-based access control: Only allow certain roles to access specific resources
 def require_role(allowed_roles: list):
-    def role_dependency(current_user: models.User = Depends(get_current_user)):
+    def role_dependency(current_user: Principal = Depends(get_current_user)):
         # Check if the user's role is in the allowed roles list (case-insensitive check)
         if current_user.role.lower() not in [role.lower() for role in allowed_roles]:
             raise HTTPException(status_code=403, detail="You do not have permission to access this resource")
@@ -128,5 +283,5 @@ def require_role(allowed_roles: list):
 
 # Route to get the current user's information
 @router.get("/me", response_model=schemas.UserResponse)
-def get_user_info(current_user: models.User = Depends(get_current_user)):
+def get_user_info(current_user: Principal = Depends(get_current_user)):
     return schemas.UserResponse.from_orm(current_user)
\ No newline at end of file
@@ -0,0 +1,126 @@
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache import TTLCache
+from app.config import settings
+from app.database import get_async_db
+from app.models import Lease, Payment, Property, SupportTicket, Tenant, Unit, User
+from app.schemas import DashboardSummary
+from app.routers.auth import require_role
+
+router = APIRouter()
+
+# Summaries are recomputed at most once per (admin, month) key every DASHBOARD_CACHE_TTL seconds
+summary_cache = TTLCache(maxsize=256, ttl=settings.DASHBOARD_CACHE_TTL)
+
+
+def month_bounds(month: Optional[str]):
+    if month is None:
+        start = date.today().replace(day=1)
+    else:
+        try:
+            start = date.fromisoformat(f"{month}-01")
+        except ValueError:
+            raise HTTPException(status_code=400, detail="month must be YYYY-MM")
+    end = date(start.year + (start.month == 12), start.month % 12 + 1, 1)
+    return start, end
+
+
+# Every aggregate covers only the properties the admin owns
+async def build_summary(db: AsyncSession, admin_id: int, start: date, end: date) -> dict:
+    properties = (await db.execute(
+        select(Property.id, Property.name).where(Property.admin_id == admin_id).order_by(Property.id)
+    )).all()
+    summary = {
+        pid: {
+            "property_id": pid, "name": name, "total_units": 0, "units_by_status": {},
+            "active_leases": 0, "expected_rent": 0.0, "collected_rent": 0.0,
+        }
+        for pid, name in properties
+    }
+
+    # Units per property and status
+    units = await db.execute(
+        select(Unit.property_id, Unit.status, func.count(Unit.id))
+        .join(Property, Unit.property_id == Property.id)
+        .where(Property.admin_id == admin_id)
+        .group_by(Unit.property_id, Unit.status)
+    )
+    for pid, unit_status, count in units:
+        if pid in summary:
+            summary[pid]["units_by_status"][unit_status or "unknown"] = count
+            summary[pid]["total_units"] += count
+
+    # Leases active at any point in the month and the rent they owe
+    leases = await db.execute(
+        select(Unit.property_id, func.count(Lease.id), func.coalesce(func.sum(Lease.rent_amount), 0))
+        .join(Unit, Lease.unit_id == Unit.id)
+        .join(Property, Unit.property_id == Property.id)
+        .where(Property.admin_id == admin_id)
+        .where(Lease.lease_status == "Active", Lease.start_date < end, Lease.end_date >= start)
+        .group_by(Unit.property_id)
+    )
+    for pid, count, expected in leases:
+        if pid in summary:
+            summary[pid]["active_leases"] = count
+            summary[pid]["expected_rent"] = float(expected)
+
+    # Rent actually collected during the month
+    payments = await db.execute(
+        select(Unit.property_id, func.coalesce(func.sum(Payment.amount_paid), 0))
+        .join(Lease, Payment.lease_id == Lease.id)
+        .join(Unit, Lease.unit_id == Unit.id)
+        .join(Property, Unit.property_id == Property.id)
+        .where(Property.admin_id == admin_id)
+        .where(Payment.payment_status == "succeeded", Payment.created_at >= start, Payment.created_at < end)
+        .group_by(Unit.property_id)
+    )
+    for pid, collected in payments:
+        if pid in summary:
+            summary[pid]["collected_rent"] = float(collected)
+
+    # Tickets raised by tenants leasing a unit in one of the admin's properties;
+    # a tenant with several leases must not count a ticket twice
+    open_tickets = await db.scalar(
+        select(func.count(SupportTicket.id.distinct()))
+        .join(Tenant, SupportTicket.tenant_id == Tenant.id)
+        .join(Lease, Lease.tenant_id == Tenant.id)
+        .join(Unit, Lease.unit_id == Unit.id)
+        .join(Property, Unit.property_id == Property.id)
+        .where(Property.admin_id == admin_id, func.lower(SupportTicket.status) != "closed")
+    )
+
+    rows = list(summary.values())
+    for row in rows:
+        row["outstanding_rent"] = max(0.0, row["expected_rent"] - row["collected_rent"])
+
+    return {
+        "month": start.strftime("%Y-%m"),
+        "total_units": sum(r["total_units"] for r in rows),
+        "active_leases": sum(r["active_leases"] for r in rows),
+        "expected_rent": sum(r["expected_rent"] for r in rows),
+        "collected_rent": sum(r["collected_rent"] for r in rows),
+        "outstanding_rent": sum(r["outstanding_rent"] for r in rows),
+        "open_tickets": open_tickets or 0,
+        "properties": rows,
+    }
+
+
+# 📈 Occupancy, Rent Roll and Open Tickets (Admins only)
+@router.get("/summary", response_model=DashboardSummary)
+async def get_summary(
+    month: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_role(["Admin"]))
+):
+    start, end = month_bounds(month)
+    key = (current_user.id, start)
+    summary = summary_cache.get(key)
+    if summary is None:
+        summary = await build_summary(db, current_user.id, start, end)
+        summary_cache.set(key, summary)
+    return summary
@@ -1,25 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Optional
+from datetime import date
+from app import policy
+from app.bulk_import import BulkImport, existing_ids
 from app.database import get_db
+from app.export import stream_export
 from app.models import Lease, Tenant, Unit, User
-from app.schemas import LeaseCreate, LeaseResponse
-from app.routers.auth import get_current_user, require_role
+from app.pagination import PageParams, paginate_rows
+from app.schemas import ImportReport, LeaseCreate, LeaseImport, LeaseResponse, Page
+from app.routers.auth import get_current_tenant, get_current_user, require_role
+from app.serializers import PageSerializer
 
 router = APIRouter()
+lease_pages = PageSerializer(LeaseResponse, Lease)
 
 # 🏠 Create a Lease (Only Admins can create leases)
 @router.post("/", response_model=LeaseResponse)
 def create_lease(
     lease_data: LeaseCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_tenant)  # 404s unless the user has a tenant profile
 ):
-    # Find tenant (implicitly associated with the logged-in user)
-    tenant = db.query(Tenant).filter(Tenant.user_id == current_user.id).first()
-    if not tenant:
-        raise HTTPException(status_code=404, detail="Tenant not found")
-
     # Automatically assign the first available unit to the lease
     unit = db.query(Unit).first()
     if not unit:
@@ -27,7 +30,7 @@ def create_lease(
 
     # Create the lease
     new_lease = Lease(
-        tenant_id=tenant.id,
+        tenant_id=current_user.tenant_id,
         unit_id=unit.id,
         start_date=lease_data.start_date,
         end_date=lease_data.end_date,
@@ -41,18 +44,60 @@ def create_lease(
     return new_lease
 
 
+# 📥 Bulk import Leases from CSV or NDJSON (Admin Only)
+@router.post("/import", response_model=ImportReport)
+def import_leases(
+    file: UploadFile = File(...),
+    format: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_role(["Admin"]))
+):
+    today = date.today()
+    importer = BulkImport(
+        Lease,
+        LeaseImport,
+        lambda lease: {**lease.model_dump(), "created_at": today, "updated_at": today},
+        references={"tenant_id": existing_ids(Tenant.id), "unit_id": existing_ids(Unit.id)},
+    )
+    return importer.run(db, file, format)
+
+
 # 📋 Get All Leases (Admins see all, Tenants see their own)
-@router.get("/", response_model=List[LeaseResponse])
+@router.get("/", response_model=Page[LeaseResponse])
 def get_leases(
+    lease_status: Optional[str] = None,
+    unit_id: Optional[int] = None,
+    page: PageParams = Depends(),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    if current_user.role == "Admin":
-        return db.query(Lease).all()
-    tenant = db.query(Tenant).filter(Tenant.user_id == current_user.id).first()
-    if not tenant:
-        raise HTTPException(status_code=404, detail="Tenant not found")
-    return db.query(Lease).filter(Lease.tenant_id == tenant.id).all()
+    stmt = policy.leases.scope(lease_pages.select(), current_user)
+    if lease_status is not None:
+        stmt = stmt.where(Lease.lease_status == lease_status)
+    if unit_id is not None:
+        stmt = stmt.where(Lease.unit_id == unit_id)
+    return lease_pages.render(paginate_rows(db, stmt, Lease, page, sortable=("id", "created_at")))
+
+
+# 📤 Export Leases as NDJSON or CSV (Admin Only)
+@router.get("/export")
+def export_leases(
+    format: str = "ndjson",
+    current_user: User = Depends(require_role(["Admin"]))
+):
+    stmt = select(
+        Lease.id,
+        Lease.tenant_id,
+        Lease.unit_id,
+        Lease.start_date,
+        Lease.end_date,
+        Lease.rent_amount,
+        Lease.deposit_amount,
+        Lease.lease_status,
+        Lease.created_at,
+        Lease.updated_at,
+    ).order_by(Lease.id)
+    return stream_export(stmt, "leases", format)
 
 
 # 🔍 Get Single Lease (Only Admins or the Tenant)
@@ -62,11 +107,9 @@ def get_lease(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    lease = db.query(Lease).filter(Lease.id == lease_id).first()
+    lease = policy.leases.get(db, current_user, lease_id)
     if not lease:
         raise HTTPException(status_code=404, detail="Lease not found")
-    if current_user.role == "Tenant" and lease.tenant_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized to view this lease")
     return lease
 
 
@@ -78,14 +121,11 @@ def update_lease(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    lease = db.query(Lease).filter(Lease.id == lease_id).first()
+    # Only Admins or the Tenant who owns the lease can load it
+    lease = policy.leases.get(db, current_user, lease_id)
     if not lease:
         raise HTTPException(status_code=404, detail="Lease not found")
     
-    # Only Admins or the Tenant who owns the lease can update it
-    if current_user.role == "Tenant" and lease.tenant_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized to update this lease")
-    
     # Update lease details
     lease.start_date = lease_data.start_date or lease.start_date
     lease.end_date = lease_data.end_date or lease.end_date
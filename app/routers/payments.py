@@ -206,16 +206,19 @@
 
 import stripe
 from fastapi import APIRouter, HTTPException, Depends, Request
-from sqlalchemy.orm import Session
-from app.database import get_db
-from app.models import Payment, Lease, Tenant, User
-from app.schemas import PaymentCreate, PaymentUpdate, PaymentResponse
-from app.routers.auth import get_current_user
-from app.config import STRIPE_SECRET_KEY, STRIPE_WEBHOOK_SECRET
-from typing import List
-
-# Initialize Stripe
-stripe.api_key = STRIPE_SECRET_KEY
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import policy
+from app.database import get_async_db
+from app.export import stream_export
+from app.models import Payment, Lease, User
+from app.pagination import PageParams, apaginate
+from app.schemas import Page, PaymentCreate, PaymentUpdate, PaymentResponse
+from app.routers.auth import get_current_tenant, get_current_user, require_role
+from app.config import STRIPE_WEBHOOK_SECRET
+from app.stripe_client import StripeUnavailable, stripe_gateway
+from app.stripe_events import record_event, stripe_event_worker
+from typing import Optional
 
 router = APIRouter()
 
@@ -223,24 +226,19 @@ router = APIRouter()
 @router.post("/pay", response_model=PaymentResponse)
 async def create_payment(
     payment_data: PaymentCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_tenant)
 ):
-    lease = (
-        db.query(Lease)
-        .join(Tenant)
-        .filter(Tenant.user_id == current_user.id)
-        .first()
-    )
+    lease = await db.scalar(select(Lease).where(Lease.tenant_id == current_user.tenant_id).limit(1))
     if not lease:
         raise HTTPException(status_code=404, detail="Lease not found for the tenant.")
     
     amount_paid = payment_data.amount_paid or lease.rent_amount
 
     try:
-        checkout_session = stripe.checkout.Session.create(
-            payment_method_types=["card"],
-            line_items=[
+        checkout_session = await stripe_gateway.create_checkout_session({
+            "payment_method_types": ["card"],
+            "line_items": [
                 {
                     "price_data": {
                         "currency": "usd",
@@ -250,13 +248,13 @@ async def create_payment(
                     "quantity": 1,
                 }
             ],
-            mode="payment",
-            success_url="https://rental-eta-lake.vercel.app/success?session_id={CHECKOUT_SESSION_ID}",
-            cancel_url="https://rental-eta-lake.vercel.app/cancel",
-            payment_intent_data={
+            "mode": "payment",
+            "success_url": "https://rental-eta-lake.vercel.app/success?session_id={CHECKOUT_SESSION_ID}",
+            "cancel_url": "https://rental-eta-lake.vercel.app/cancel",
+            "payment_intent_data": {
                 "metadata": {"lease_id": lease.id, "tenant_id": lease.tenant_id}
             },
-        )
+        })
 
         payment = Payment(
             tenant_id=lease.tenant_id,
@@ -266,8 +264,8 @@ async def create_payment(
             stripe_payment_intent_id=checkout_session.id
         )
         db.add(payment)
-        db.commit()
-        db.refresh(payment)
+        await db.commit()
+        await db.refresh(payment)
 
         return PaymentResponse(
             checkout_url=checkout_session.url,
@@ -275,13 +273,17 @@ async def create_payment(
             amount_paid=payment.amount_paid,
             payment_status=payment.payment_status
         )
+    except StripeUnavailable:
+        raise HTTPException(status_code=503, detail="Payment provider unavailable, try again shortly")
     except stripe.error.StripeError as e:
         raise HTTPException(status_code=400, detail=f"Stripe error: {e.user_message}")
 
 
 # 🧾 Webhook to Handle Stripe Payment Confirmation
+# Verified events land in the stripe_events inbox and are acknowledged at
+# once; StripeEventWorker applies the payment status changes in batches.
 @router.post("/webhook")
-async def stripe_webhook(request: Request, db: Session = Depends(get_db)):
+async def stripe_webhook(request: Request, db: AsyncSession = Depends(get_async_db)):
     payload = await request.body()
     sig_header = request.headers.get('Stripe-Signature')
     
@@ -290,47 +292,73 @@ async def stripe_webhook(request: Request, db: Session = Depends(get_db)):
     except (ValueError, stripe.error.SignatureVerificationError):
         return {"status": "ignored"}  # ✅ Always return 200 OK
 
-    session = event['data']['object']
-    payment = db.query(Payment).filter_by(stripe_payment_intent_id=session['id']).first()
-
-    if payment:
-        if event['type'] == 'checkout.session.completed':
-            payment.payment_status = 'succeeded'
-        elif event['type'] == 'payment_intent.payment_failed':
-            payment.payment_status = 'failed'
-        db.commit()
+    await record_event(db, event, payload)
+    stripe_event_worker.notify()
 
     return {"status": "success"}
 
 
 # 💜 Get All Payments (Admin Only)
-@router.get("/", response_model=List[PaymentResponse])
+@router.get("/", response_model=Page[PaymentResponse])
 async def get_all_payments(
-    db: Session = Depends(get_db), 
+    payment_status: Optional[str] = None,
+    tenant_id: Optional[int] = None,
+    lease_id: Optional[int] = None,
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_db), 
     current_user: User = Depends(get_current_user)
 ):
     if current_user.role.lower() != "admin":
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    payments = db.query(Payment).all()
-    return [
+    stmt = select(Payment)
+    if payment_status is not None:
+        stmt = stmt.where(Payment.payment_status == payment_status)
+    if tenant_id is not None:
+        stmt = stmt.where(Payment.tenant_id == tenant_id)
+    if lease_id is not None:
+        stmt = stmt.where(Payment.lease_id == lease_id)
+
+    result = await apaginate(db, stmt, Payment, page, sortable=("id", "created_at"))
+    result["items"] = [
         PaymentResponse(
             payment_id=str(p.id),
             amount_paid=float(p.amount_paid),
             payment_status=p.payment_status,
             checkout_url=f"https://checkout.stripe.com/pay/{p.stripe_payment_intent_id}" if p.stripe_payment_intent_id else ""
-        ) for p in payments
+        ) for p in result["items"]
     ]
+    return result
+
+
+# 📤 Export Payments as NDJSON or CSV (Admin Only)
+@router.get("/export")
+def export_payments(
+    format: str = "ndjson",
+    current_user: User = Depends(require_role(["Admin"]))
+):
+    stmt = select(
+        Payment.id,
+        Payment.tenant_id,
+        Payment.lease_id,
+        Payment.amount_paid,
+        Payment.payment_status,
+        Payment.stripe_payment_intent_id,
+        Payment.created_at,
+    ).order_by(Payment.id)
+    return stream_export(stmt, "payments", format)
 
 
 @router.get("/payments/verify")
-async def verify_payment(session_id: str, db: Session = Depends(get_db)):
+async def verify_payment(session_id: str, db: AsyncSession = Depends(get_async_db)):
     try:
-        session = stripe.checkout.Session.retrieve(session_id)
-        payment = db.query(Payment).filter_by(stripe_payment_intent_id=session_id).first()
+        session = await stripe_gateway.retrieve_checkout_session(session_id)
+        payment = await db.scalar(select(Payment).filter_by(stripe_payment_intent_id=session_id))
         if not payment:
             raise HTTPException(status_code=404, detail="Payment not found")
         return {"status": session.status}  # ✅ Corrected property
+    except StripeUnavailable:
+        raise HTTPException(status_code=503, detail="Payment provider unavailable, try again shortly")
     except stripe.error.StripeError as e:
         raise HTTPException(status_code=400, detail=f"Stripe error: {e.user_message}")
 
@@ -339,17 +367,13 @@ async def verify_payment(session_id: str, db: Session = Depends(get_db)):
 @router.get("/{payment_id}", response_model=PaymentResponse)
 async def get_payment(
     payment_id: int, 
-    db: Session = Depends(get_db), 
+    db: AsyncSession = Depends(get_async_db), 
     current_user: User = Depends(get_current_user)
 ):
-    payment = db.query(Payment).filter(Payment.id == payment_id).first()
+    payment = await policy.payments.aget(db, current_user, payment_id)
     if not payment:
         raise HTTPException(status_code=404, detail="Payment not found")
     
-    tenant = db.query(Tenant).filter(Tenant.user_id == current_user.id).first()
-    if current_user.role.lower() != "admin" and payment.tenant_id != tenant.id:
-        raise HTTPException(status_code=403, detail="Not authorized")
-    
     return PaymentResponse(
         payment_id=str(payment.id),
         amount_paid=float(payment.amount_paid),
@@ -363,20 +387,20 @@ async def get_payment(
 async def update_payment(
     payment_id: int, 
     updated_payment: PaymentUpdate, 
-    db: Session = Depends(get_db), 
+    db: AsyncSession = Depends(get_async_db), 
     current_user: User = Depends(get_current_user)
 ):
     if current_user.role.lower() != "admin":
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    payment = db.query(Payment).filter(Payment.id == payment_id).first()
+    payment = await db.get(Payment, payment_id)
     if not payment:
         raise HTTPException(status_code=404, detail="Payment not found")
     
     payment.amount_paid = updated_payment.amount_paid or payment.amount_paid
     payment.payment_status = updated_payment.payment_status or payment.payment_status
-    db.commit()
-    db.refresh(payment)
+    await db.commit()
+    await db.refresh(payment)
     return PaymentResponse(
         payment_id=str(payment.id),
         amount_paid=float(payment.amount_paid),
@@ -389,16 +413,16 @@ async def update_payment(
 @router.delete("/{payment_id}")
 async def delete_payment(
     payment_id: int, 
-    db: Session = Depends(get_db), 
+    db: AsyncSession = Depends(get_async_db), 
     current_user: User = Depends(get_current_user)
 ):
     if current_user.role.lower() != "admin":
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    payment = db.query(Payment).filter(Payment.id == payment_id).first()
+    payment = await db.get(Payment, payment_id)
     if not payment:
         raise HTTPException(status_code=404, detail="Payment not found")
     
-    db.delete(payment)
-    db.commit()
+    await db.delete(payment)
+    await db.commit()
     return {"detail": "Payment deleted successfully"}
@@ -1,16 +1,24 @@
 
 
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, File, HTTPException, Request, Response, UploadFile, status
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Optional
 
+from app.bulk_import import BulkImport
+from app.conditional import conditional
 from app.database import get_db
+from app.response_cache import CachedView
 from app.models import Property, User
-from app.schemas import PropertyCreate, PropertyResponse
+from app.pagination import PageParams, paginate
+from app import policy, repository
+from app.schemas import ImportReport, Page, PropertyCreate, PropertyDetail, PropertyResponse
 from app.routers.auth import get_current_user, require_role
 
 router = APIRouter()
+property_list_view = CachedView(Page[PropertyResponse], "properties")
+property_view = CachedView(PropertyResponse, "properties")
 
 # 🏠 Create Property (Admins only)
 @router.post("/", response_model=PropertyResponse)
@@ -33,43 +41,95 @@ def create_property(
     return new_property
 
 
+# 📥 Bulk import Properties from CSV or NDJSON (Admins only)
+@router.post("/import", response_model=ImportReport)
+def import_properties(
+    file: UploadFile = File(...),
+    format: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_role(["Admin"]))
+):
+    importer = BulkImport(
+        Property,
+        PropertyCreate,
+        lambda prop: {
+            "name": prop.name,
+            "location": prop.location,
+            "description": prop.description or "",
+            "image_url": prop.image_url or "",
+            "admin_id": current_user.id,
+        },
+    )
+    return importer.run(db, file, format)
+
+
 # 📋 Get All Properties
-@router.get("/", response_model=List[PropertyResponse])
+@router.get("/", response_model=Page[PropertyResponse], dependencies=[Depends(conditional("properties"))])
 def get_properties(
+    request: Request,
+    response: Response,
+    location: Optional[str] = None,
+    admin_id: Optional[int] = None,
+    page: PageParams = Depends(),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    properties = db.query(Property).all()
-    
-    for prop in properties:
+    key, body = property_list_view.lookup(request, current_user.role)
+    if body is not None:
+        return property_list_view.respond(body, response)
+
+    stmt = select(Property)
+    if location is not None:
+        stmt = stmt.where(Property.location == location)
+    if admin_id is not None:
+        stmt = stmt.where(Property.admin_id == admin_id)
+
+    result = paginate(db, stmt, Property, page)
+    for prop in result["items"]:
         prop.description = prop.description or ""
         prop.image_url = prop.image_url or ""
-    
-    return properties
+
+    return property_list_view.respond(property_list_view.store(key, result), response)
 
 
 # 🔍 Get Single Property
-@router.get("/{property_id}", response_model=PropertyResponse)
+@router.get("/{property_id}", response_model=PropertyResponse, dependencies=[Depends(conditional("properties"))])
 def get_property(
     property_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    property = db.query(Property).filter(Property.id == property_id).first()
+    # Admins share entries; anyone else only sees what they were allowed before
+    scope = "Admin" if current_user.role == "Admin" else f"user:{current_user.id}"
+    key, body = property_view.lookup(request, scope)
+    if body is not None:
+        return property_view.respond(body, response)
+
+    property = policy.properties.get(db, current_user, property_id)
     if not property:
         raise HTTPException(status_code=404, detail="Property not found")
 
-    if current_user.role == "Admin" or current_user.id == property.admin_id:
-        property.description = property.description or ""
-        property.image_url = property.image_url or ""
-        return property
+    property.description = property.description or ""
+    property.image_url = property.image_url or ""
+    return property_view.respond(property_view.store(key, property), response)
 
-    if current_user.role == "Tenant" and current_user.id == property.admin_id:
-        property.description = property.description or ""
-        property.image_url = property.image_url or ""
-        return property
-    else:
-        raise HTTPException(status_code=403, detail="Not authorized to view this property")
+
+# 🏘️ Get a Property with its Units, their current Leases and Tenants (Admins only)
+@router.get("/{property_id}/details", response_model=PropertyDetail)
+def get_property_details(
+    property_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_role(["Admin"]))
+):
+    property = repository.properties.get(db, property_id, "detail")
+    if not property:
+        raise HTTPException(status_code=404, detail="Property not found")
+
+    property.description = property.description or ""
+    property.image_url = property.image_url or ""
+    return property
 
 
 # ✏️ Update Property
@@ -0,0 +1,63 @@
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app import reports
+from app.config import settings
+from app.database import get_db
+from app.export import check_format, stream_rows
+from app.models import User
+from app.pagination import PageParams, paginate_list
+from app.schemas import ArrearsRow, Page
+from app.routers.auth import require_role
+
+router = APIRouter()
+
+
+def _rows(db, group_by, as_of, min_balance):
+    rows = reports.arrears_report(db, as_of).rows(reports.parse_group(group_by))
+    if min_balance is not None:
+        rows = [row for row in rows if row["balance"] >= min_balance]
+    return rows
+
+
+# 📉 Rent Roll and Arrears by Lease, Tenant, Unit or Property (Admins only)
+@router.get("/arrears", response_model=Page[ArrearsRow])
+def get_arrears(
+    group_by: str = "property",
+    as_of: Optional[date] = None,
+    min_balance: Optional[float] = None,
+    page: PageParams = Depends(),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_role(["Admin"]))
+):
+    result = paginate_list(_rows(db, group_by, as_of, min_balance), page, sortable=("id", "balance"))
+    labels = reports.names(db, group_by, [row["id"] for row in result["items"]])
+    result["items"] = [{**row, "name": labels.get(row["id"])} for row in result["items"]]
+    return result
+
+
+# 📤 Export the Arrears Report as CSV or NDJSON (Admins only)
+@router.get("/arrears/export")
+def export_arrears(
+    group_by: str = "property",
+    as_of: Optional[date] = None,
+    min_balance: Optional[float] = None,
+    format: str = "csv",
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_role(["Admin"]))
+):
+    check_format(format)
+    rows = sorted(_rows(db, group_by, as_of, min_balance), key=lambda row: row["id"])
+    labels = reports.names(db, group_by)
+
+    def partitions():
+        for i in range(0, len(rows), settings.EXPORT_BATCH_SIZE):
+            yield [
+                (row["id"], labels.get(row["id"]), *(row[column] for column in reports.COLUMNS[2:]))
+                for row in rows[i:i + settings.EXPORT_BATCH_SIZE]
+            ]
+
+    return stream_rows(reports.COLUMNS, partitions(), f"arrears-{group_by}", format)
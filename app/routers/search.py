@@ -0,0 +1,51 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from app import search
+from app.config import settings
+from app.database import get_db
+from app.models import User
+from app.schemas import Page, PropertySearchHit, TicketSearchHit
+from app.routers.auth import get_current_user, require_role
+
+router = APIRouter()
+
+
+def page_size(limit: Optional[int] = Query(None, ge=1, description="Page size (capped by PAGE_SIZE_MAX)")) -> int:
+    return min(limit or settings.PAGE_SIZE_DEFAULT, settings.PAGE_SIZE_MAX)
+
+
+# 🔎 Search Tickets by Subject and Description (Admin)
+@router.get("/tickets", response_model=Page[TicketSearchHit])
+def search_tickets(
+    q: str = Query(..., min_length=1, description='Words, "quoted phrases", -excluded or alternatives'),
+    status: Optional[str] = None,
+    tenant_id: Optional[int] = None,
+    limit: int = Depends(page_size),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_role(["Admin"]))
+):
+    result = search.search(db, search.tickets, q, {"status": status, "tenant_id": tenant_id}, limit, cursor)
+    result["items"] = [{"rank": hit["rank"], "ticket": hit["row"]} for hit in result["items"]]
+    return result
+
+
+# 🔎 Search Properties by Name, Location and Description
+@router.get("/properties", response_model=Page[PropertySearchHit])
+def search_properties(
+    q: str = Query(..., min_length=1, description='Words, "quoted phrases", -excluded or alternatives'),
+    location: Optional[str] = None,
+    admin_id: Optional[int] = None,
+    limit: int = Depends(page_size),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    result = search.search(db, search.properties, q, {"location": location, "admin_id": admin_id}, limit, cursor)
+    for hit in result["items"]:
+        hit["row"].description = hit["row"].description or ""
+        hit["row"].image_url = hit["row"].image_url or ""
+    result["items"] = [{"rank": hit["rank"], "property": hit["row"]} for hit in result["items"]]
+    return result
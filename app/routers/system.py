@@ -0,0 +1,36 @@
+from fastapi import APIRouter, Depends
+
+from app import utils
+from app.database import async_engine, engine, pool_stats
+from app.models import User
+from app.profiling import route_timings
+from app.response_cache import response_cache
+from app.routers.auth import require_role
+
+router = APIRouter()
+
+# 📊 Connection Pool Statistics (Admins only)
+@router.get("/pool")
+def get_pool_stats(current_user: User = Depends(require_role(["Admin"]))):
+    return {
+        "sync": pool_stats(engine),
+        "async": pool_stats(async_engine.sync_engine),
+    }
+
+
+# 🔐 Password Hashing Pool Statistics (Admins only)
+@router.get("/password-pool")
+def get_password_pool_stats(current_user: User = Depends(require_role(["Admin"]))):
+    return utils.password_pool.stats()
+
+
+# 🗃️ Response Cache Statistics (Admins only)
+@router.get("/cache")
+def get_cache_stats(current_user: User = Depends(require_role(["Admin"]))):
+    return response_cache.stats()
+
+
+# ⏱️ Per-route Latency and Query Counts since startup (Admins only)
+@router.get("/timings")
+def get_route_timings(current_user: User = Depends(require_role(["Admin"]))):
+    return route_timings.snapshot()
@@ -1,12 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Optional
+from app.bulk_import import BulkImport, existing_ids
 from app.database import get_db
+from app.export import stream_export
 from app.models import Unit, User, Tenant, Property, Lease
-from app.schemas import TenantCreate, TenantResponse, LeaseCreate, LeaseResponse
+from app.pagination import PageParams, paginate_rows
+from app import policy, repository
+from app.schemas import ImportReport, Page, TenantCreate, TenantImport, TenantLeases, TenantResponse, LeaseCreate, LeaseResponse
 from app.routers.auth import get_current_user, require_role  # Automatically fetch current logged-in user
+from app.serializers import PageSerializer
 
 router = APIRouter()
+tenant_pages = PageSerializer(TenantResponse, Tenant)
 
 # 🏠 Register Tenant (Automatically creating tenant from user)
 @router.post("/register", response_model=TenantResponse)
@@ -16,8 +23,7 @@ def register_tenant(
     current_user: User = Depends(get_current_user)  # Automatically get the logged-in user
 ):
     # Check if the logged-in user is already a tenant
-    existing_tenant = db.query(Tenant).filter(Tenant.user_id == current_user.id).first()
-    if existing_tenant:
+    if current_user.tenant_id is not None:
         raise HTTPException(status_code=400, detail="User is already a tenant")
 
     # Create new tenant and associate it with the logged-in user
@@ -35,19 +41,52 @@ def register_tenant(
     return new_tenant
 
 
+# 📥 Bulk import Tenants from CSV or NDJSON (Only Admins)
+@router.post("/import", response_model=ImportReport)
+def import_tenants(
+    file: UploadFile = File(...),
+    format: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_role(["Admin"]))
+):
+    importer = BulkImport(
+        Tenant,
+        TenantImport,
+        lambda tenant: tenant.model_dump(),
+        references={"user_id": existing_ids(User.id)},
+    )
+    return importer.run(db, file, format)
+
+
 # 📋 Get All Tenants (Admins see all, Tenants see their own details)
-@router.get("/", response_model=List[TenantResponse])
+@router.get("/", response_model=Page[TenantResponse])
 def get_tenants(
+    email: Optional[str] = None,
+    page: PageParams = Depends(),
     db: Session = Depends(get_db),
     current_user: User = Depends(require_role(["Admin", "Tenant"]))  # Protect by role
 ):
-    if current_user.role == "Admin":
-        # Admin can view all tenants
-        return db.query(Tenant).all()
-    else:
-        # Tenants can view only their own details
-        tenant = db.query(Tenant).filter(Tenant.user_id == current_user.id).first()
-        return [tenant] if tenant else []
+    # Tenants can view only their own details
+    stmt = policy.tenants.scope(tenant_pages.select(), current_user)
+    if email is not None:
+        stmt = stmt.where(Tenant.email == email)
+    return tenant_pages.render(paginate_rows(db, stmt, Tenant, page))
+
+
+# 📤 Export Tenants as NDJSON or CSV (Only Admins)
+@router.get("/export")
+def export_tenants(
+    format: str = "ndjson",
+    current_user: User = Depends(require_role(["Admin"]))
+):
+    stmt = select(
+        Tenant.id,
+        Tenant.user_id,
+        Tenant.full_name,
+        Tenant.email,
+        Tenant.phone_number,
+    ).order_by(Tenant.id)
+    return stream_export(stmt, "tenants", format)
 
 
 # 🔍 Get Single Tenant (Only Admins or the Tenant themselves)
@@ -57,12 +96,23 @@ def get_tenant(
     db: Session = Depends(get_db),
     current_user: User = Depends(require_role(["Admin", "Tenant"]))  # Protect by role
 ):
-    tenant = db.query(Tenant).filter(Tenant.id == tenant_id).first()
+    tenant = policy.tenants.get(db, current_user, tenant_id)
+    if not tenant:
+        raise HTTPException(status_code=404, detail="Tenant not found")
+
+    return tenant
+
+
+# 📑 Get a Tenant with their Leases and Payments (Only Admins or the Tenant themselves)
+@router.get("/{tenant_id}/leases", response_model=TenantLeases)
+def get_tenant_leases(
+    tenant_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_role(["Admin", "Tenant"]))
+):
+    tenant = policy.tenants.get(db, current_user, tenant_id, repository.tenants.select("leases"))
     if not tenant:
         raise HTTPException(status_code=404, detail="Tenant not found")
-    
-    if current_user.role == "Tenant" and tenant.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="You can only view your own tenant")
 
     return tenant
 
@@ -75,13 +125,10 @@ def update_tenant(
     db: Session = Depends(get_db),
     current_user: User = Depends(require_role(["Admin", "Tenant"]))  # Protect by role
 ):
-    tenant = db.query(Tenant).filter(Tenant.id == tenant_id).first()
+    tenant = policy.tenants.get(db, current_user, tenant_id)
     if not tenant:
         raise HTTPException(status_code=404, detail="Tenant not found")
     
-    if current_user.role != "Admin" and tenant.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="You can only update your own tenant")
-    
     tenant.full_name = tenant_data.full_name
     tenant.email = tenant_data.email
     tenant.phone_number = tenant_data.phone_number
@@ -1,26 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
+from app import policy
+from app.batch_update import apply_status_changes
+from app.conditional import conditional
 from app.database import get_db
 from app.models import SupportTicket, User
-from app.schemas import TicketCreate, TicketResponse
-from app.routers.auth import get_current_user, require_role
+from app.pagination import PageParams, paginate_rows
+from app.schemas import BatchStatusReport, Page, StatusChange, TicketCreate, TicketResponse
+from app.routers.auth import get_current_tenant, require_role
+from app.serializers import PageSerializer
 
 router = APIRouter()
+ticket_pages = PageSerializer(TicketResponse, SupportTicket)
 
-# 🌼 Create Ticket (Anyone logged in can create)
+# 🌼 Create Ticket (Anyone with a tenant profile can create)
 @router.post("/", response_model=TicketResponse)
 def create_ticket(
     ticket_data: TicketCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_tenant)  # 404s unless the user has a tenant profile
 ):
     new_ticket = SupportTicket(
         subject=ticket_data.subject,
         description=ticket_data.description,
         status="Open",
-        tenant_id=current_user.id
+        tenant_id=current_user.tenant_id
     )
     db.add(new_ticket)
     db.commit()
@@ -29,23 +35,35 @@ def create_ticket(
 
 
 # 🗋 Get All Tickets (Admin)
-@router.get("/", response_model=List[TicketResponse])
+@router.get("/", response_model=Page[TicketResponse])
 def get_tickets(
+    status: Optional[str] = None,
+    tenant_id: Optional[int] = None,
+    page: PageParams = Depends(),
     db: Session = Depends(get_db),
     current_user: User = Depends(require_role(["Admin"]))
 ):
-    tickets = db.query(SupportTicket).all()
-    return tickets
+    stmt = ticket_pages.select()
+    if status is not None:
+        stmt = stmt.where(SupportTicket.status == status)
+    if tenant_id is not None:
+        stmt = stmt.where(SupportTicket.tenant_id == tenant_id)
+    return ticket_pages.render(paginate_rows(db, stmt, SupportTicket, page, sortable=("id", "created_at")))
 
 
 # 🔍 Get Tenant's Tickets
-@router.get("/my-tickets", response_model=List[TicketResponse])
+@router.get("/my-tickets", response_model=Page[TicketResponse], dependencies=[Depends(conditional("support_tickets"))])
 def get_my_tickets(
+    response: Response,
+    status: Optional[str] = None,
+    page: PageParams = Depends(),
     db: Session = Depends(get_db),
     current_user: User = Depends(require_role(["Tenant"]))
 ):
-    tickets = db.query(SupportTicket).filter(SupportTicket.tenant_id == current_user.id).all()
-    return tickets
+    stmt = policy.tickets.scope(ticket_pages.select(), current_user)
+    if status is not None:
+        stmt = stmt.where(SupportTicket.status == status)
+    return ticket_pages.render(paginate_rows(db, stmt, SupportTicket, page, sortable=("id", "created_at")), response)
 
 
 # ✏️ Update Ticket Status (Admin)
@@ -66,6 +84,16 @@ def update_ticket_status(
     return {"message": "Ticket status updated", "ticket": ticket}
 
 
+# ✏️ Update Many Ticket Statuses at Once (Admin)
+@router.patch("/status", response_model=BatchStatusReport)
+def update_ticket_statuses(
+    changes: List[StatusChange],
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_role(["Admin"]))
+):
+    return apply_status_changes(db, SupportTicket, changes)
+
+
 # ❌ Delete Ticket (Admin)
 @router.delete("/{ticket_id}")
 def delete_ticket(
@@ -1,15 +1,25 @@
 
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, File, HTTPException, Request, Response, UploadFile, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
-from app.database import get_db
+from app.batch_update import apply_status_changes
+from app.bulk_import import BulkImport, existing_ids
+from app.conditional import conditional
+from app.database import get_async_db, get_db
+from app.response_cache import CachedView
 from app.models import Property, Unit, User, Lease
-from app.schemas import UnitCreate, UnitResponse
-from app.routers.auth import get_current_user
+from app.pagination import PageParams, apaginate
+from app import repository
+from app.schemas import BatchStatusReport, ImportReport, Page, StatusChange, UnitCreate, UnitImport, UnitResponse
+from app.routers.auth import get_current_user, require_role
 
 router = APIRouter()
+unit_list_view = CachedView(Page[UnitResponse], "units")
+unit_view = CachedView(UnitResponse, "units")
 
 
 # Create a Unit (Admin or Tenant)
@@ -26,7 +36,11 @@ def create_unit(
             raise HTTPException(status_code=404, detail="No property found for the admin")
     else:
         # Tenant can only create a unit in the property they are leasing
-        lease = db.query(Lease).filter(Lease.tenant_id == current_user.id).first()
+        lease = None
+        if current_user.tenant_id is not None:
+            lease = db.scalars(
+                repository.leases.select("with_unit").where(Lease.tenant_id == current_user.tenant_id).limit(1)
+            ).first()
         if not lease:
             raise HTTPException(status_code=403, detail="Tenants can only create units in their leased property")
         property = lease.unit.property
@@ -42,23 +56,55 @@ def create_unit(
     db.refresh(new_unit)
     return new_unit
 
+# Bulk import Units from CSV or NDJSON (Admin only, into their own properties)
+@router.post("/import", response_model=ImportReport)
+def import_units(
+    file: UploadFile = File(...),
+    format: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_role(["Admin"]))
+):
+    importer = BulkImport(
+        Unit,
+        UnitImport,
+        lambda unit: {"name": unit.name, "status": unit.status, "property_id": unit.property_id},
+        references={"property_id": existing_ids(Property.id, Property.admin_id == current_user.id)},
+    )
+    return importer.run(db, file, format)
+
 
 # Get All Units (Protected)
-@router.get("/", response_model=List[UnitResponse])
+@router.get("/", response_model=Page[UnitResponse], dependencies=[Depends(conditional("units"))])
 async def get_units(
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    status: Optional[str] = None,
+    property_id: Optional[int] = None,
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
-    return db.query(Unit).all()
+    key, body = await unit_list_view.alookup(request, current_user.role)
+    if body is None:
+        stmt = select(Unit)
+        if status is not None:
+            stmt = stmt.where(Unit.status == status)
+        if property_id is not None:
+            stmt = stmt.where(Unit.property_id == property_id)
+        body = await unit_list_view.astore(key, await apaginate(db, stmt, Unit, page))
+    return unit_list_view.respond(body, response)
 
 
 # Get Unit by ID (Protected)
 @router.get("/{unit_id}", response_model=UnitResponse)
-async def get_unit(unit_id: int, db: Session = Depends(get_db)):
-    unit = db.query(Unit).filter(Unit.id == unit_id).first()
-    if not unit:
-        raise HTTPException(status_code=404, detail="Unit not found")
-    return unit
+async def get_unit(unit_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
+    key, body = await unit_view.alookup(request, "public")
+    if body is None:
+        unit = await db.get(Unit, unit_id)
+        if not unit:
+            raise HTTPException(status_code=404, detail="Unit not found")
+        body = await unit_view.astore(key, unit)
+    return unit_view.respond(body)
 
 
 # Update Unit (Admin only)
@@ -66,38 +112,48 @@ async def get_unit(unit_id: int, db: Session = Depends(get_db)):
 async def update_unit(
     unit_id: int,
     unit_data: UnitCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     if current_user.role != "Admin":
         raise HTTPException(status_code=403, detail="Only admins can update units")
 
-    unit = db.query(Unit).filter(Unit.id == unit_id).first()
+    unit = await db.get(Unit, unit_id)
     if not unit:
         raise HTTPException(status_code=404, detail="Unit not found")
 
     for key, value in unit_data.dict().items():
         setattr(unit, key, value)
-    db.commit()
-    db.refresh(unit)
+    await db.commit()
+    await db.refresh(unit)
     return unit
 
 
+# Update Many Unit Statuses at Once, e.g. after a maintenance sweep (Admin only)
+@router.patch("/status", response_model=BatchStatusReport)
+def update_unit_statuses(
+    changes: List[StatusChange],
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_role(["Admin"]))
+):
+    return apply_status_changes(db, Unit, changes)
+
+
 # Delete Unit (Admin only)
 @router.delete("/{unit_id}")
 async def delete_unit(
     unit_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     if current_user.role != "Admin":
         raise HTTPException(status_code=403, detail="Only admins can delete units")
     
-    unit = db.query(Unit).filter(Unit.id == unit_id).first()
+    unit = await db.get(Unit, unit_id)
     if not unit:
         raise HTTPException(status_code=404, detail="Unit not found")
-    db.delete(unit)
-    db.commit()
+    await db.delete(unit)
+    await db.commit()
     return {"message": "Unit deleted successfully"}
 
 
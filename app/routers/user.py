@@ -1,22 +1,33 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Optional
 
 from app.database import get_db
 from app.models import User
-from app.schemas import UserResponse, UserUpdate
-from app.routers.auth import get_current_user, require_role  # Import authentication functions
+from app.pagination import PageParams, paginate_rows
+from app.schemas import Page, UserResponse, UserUpdate
+from app.routers.auth import get_current_user, invalidate_principal, require_role  # Import authentication functions
+from app.serializers import PageSerializer
 
 router = APIRouter()
+user_pages = PageSerializer(UserResponse, User)
 
 # 🛡️ Get All Users (Only Admins)
-@router.get("/", response_model=List[UserResponse])
+@router.get("/", response_model=Page[UserResponse])
 def get_users(
+    role: Optional[str] = None,
+    is_active: Optional[bool] = None,
+    page: PageParams = Depends(),
     db: Session = Depends(get_db),
     current_user: User = Depends(require_role(["Admin"]))  # ✅ Only Admins can access
 ):
     print(f"Current User: {current_user.email}, Role: {current_user.role}")  # Debugging
-    return db.query(User).all()
+    stmt = user_pages.select()
+    if role is not None:
+        stmt = stmt.where(User.role == role)
+    if is_active is not None:
+        stmt = stmt.where(User.is_active == is_active)
+    return user_pages.render(paginate_rows(db, stmt, User, page))
 
 # 🔍 Get Single User by ID (Admin or the user themselves)
 @router.get("/{user_id}", response_model=UserResponse)
@@ -66,6 +77,7 @@ def update_user(
 
     db.commit()
     db.refresh(user)
+    invalidate_principal(user.id)
     return user
 
 # ❌ Delete User (Only Admins)
@@ -85,4 +97,5 @@ def delete_user(
 
     db.delete(user)
     db.commit()
+    invalidate_principal(user_id)
     return {"message": "User deleted successfully"}
@@ -0,0 +1,249 @@
+import argparse
+import asyncio
+import logging
+import zlib
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import exists, func, select, text, update
+
+from app.config import settings
+from app.database import AsyncSessionLocal, dialect_insert
+from app.models import JobCheckpoint, Lease, Notification, RentCharge, Tenant, Unit
+from app.reports import add_months, charges_due
+
+logger = logging.getLogger(__name__)
+
+ACTIVE = "Active"
+EXPIRED = "Expired"
+
+
+# Where today's run of a job stands: 0 to start, the last processed lease
+# id to resume, or None when it already finished today
+async def load_checkpoint(db, job: str, today: date):
+    checkpoint = await db.get(JobCheckpoint, job)
+    if checkpoint is None or checkpoint.run_date != today:
+        return 0
+    if checkpoint.completed:
+        return None
+    return checkpoint.last_id
+
+
+async def save_checkpoint(db, job: str, today: date, last_id: int, completed: bool):
+    values = {"run_date": today, "last_id": last_id, "completed": completed, "updated_at": datetime.utcnow()}
+    stmt = dialect_insert(db.bind, JobCheckpoint).values(job=job, **values)
+    await db.execute(stmt.on_conflict_do_update(index_elements=["job"], set_=values))
+
+
+async def enqueue(db, notifications: list):
+    if notifications:
+        stmt = dialect_insert(db.bind, Notification).values(notifications)
+        await db.execute(stmt.on_conflict_do_nothing(index_elements=["dedupe_key"]))
+
+
+def notification(user_id, kind: str, message: str, dedupe_key: str) -> dict:
+    return {"user_id": user_id, "kind": kind, "message": message,
+            "dedupe_key": dedupe_key, "created_at": datetime.utcnow()}
+
+
+# Flip leases past their end date to Expired and free their units
+class ExpireLeases:
+    name = "expire_leases"
+
+    def query(self, today: date):
+        return (
+            select(Lease.id, Lease.unit_id, Tenant.user_id, Lease.end_date)
+            .outerjoin(Tenant, Lease.tenant_id == Tenant.id)
+            .where(Lease.lease_status == ACTIVE, Lease.end_date < today)
+        )
+
+    async def apply(self, db, rows, today: date) -> int:
+        await db.execute(
+            update(Lease)
+            .where(Lease.id.in_([row.id for row in rows]), Lease.lease_status == ACTIVE)
+            .values(lease_status=EXPIRED, updated_at=today)
+            .execution_options(synchronize_session=False)
+        )
+        # A unit with another lease still active stays occupied
+        await db.execute(
+            update(Unit)
+            .where(
+                Unit.id.in_({row.unit_id for row in rows if row.unit_id is not None}),
+                ~exists().where(Lease.unit_id == Unit.id, Lease.lease_status == ACTIVE),
+            )
+            .values(status="available")
+            .execution_options(synchronize_session=False)
+        )
+        await enqueue(db, [
+            notification(row.user_id, "lease_expired", f"Your lease ended on {row.end_date}", f"lease_expired:{row.id}")
+            for row in rows if row.user_id is not None
+        ])
+        return len(rows)
+
+
+# Create the rent charges falling due in the next RENT_DUE_DAYS_AHEAD days
+# and a reminder for each, following the same schedule as the arrears report
+class CreateRentCharges:
+    name = "rent_charges"
+
+    def __init__(self, days_ahead: int = None):
+        self.days_ahead = settings.RENT_DUE_DAYS_AHEAD if days_ahead is None else days_ahead
+
+    def query(self, today: date):
+        return (
+            select(Lease.id, Lease.tenant_id, Tenant.user_id, Lease.start_date, Lease.end_date, Lease.rent_amount)
+            .outerjoin(Tenant, Lease.tenant_id == Tenant.id)
+            .where(
+                Lease.lease_status == ACTIVE,
+                Lease.start_date <= today + timedelta(days=self.days_ahead),
+                Lease.end_date > today,
+            )
+        )
+
+    async def apply(self, db, rows, today: date) -> int:
+        horizon = today + timedelta(days=self.days_ahead)
+        charges, users = [], {}
+        for row in rows:
+            users[row.id] = row.user_id
+            k = charges_due(row.start_date, today - timedelta(days=1))
+            due = add_months(row.start_date, k)
+            while due <= horizon and due < row.end_date:
+                charges.append({"lease_id": row.id, "tenant_id": row.tenant_id, "due_date": due,
+                                "amount": row.rent_amount, "created_at": datetime.utcnow()})
+                k += 1
+                due = add_months(row.start_date, k)
+        if not charges:
+            return 0
+
+        # Only charges that did not exist yet come back, so reruns add nothing
+        created = (await db.execute(
+            dialect_insert(db.bind, RentCharge).values(charges)
+            .on_conflict_do_nothing(index_elements=["lease_id", "due_date"])
+            .returning(RentCharge.lease_id, RentCharge.due_date, RentCharge.amount)
+        )).all()
+        await enqueue(db, [
+            notification(users[lease_id], "rent_due", f"Rent of {amount:.2f} is due on {due_date}",
+                         f"rent_due:{lease_id}:{due_date}")
+            for lease_id, due_date, amount in created if users.get(lease_id) is not None
+        ])
+        return len(created)
+
+
+# Only one process at a time runs a job: on Postgres it holds a session
+# advisory lock for the whole run, on a connection of its own in
+# autocommit so nothing sits idle in a transaction. Other processes that
+# wake up meanwhile skip the job. Elsewhere (SQLite in development) there
+# is nothing to lock and the job just runs.
+@asynccontextmanager
+async def job_lock(name: str, session_factory=AsyncSessionLocal):
+    async with session_factory() as db:
+        if db.bind.dialect.name != "postgresql":
+            yield True
+            return
+        conn = await db.connection(execution_options={"isolation_level": "AUTOCOMMIT"})
+        key = zlib.crc32(f"scheduler:{name}".encode())
+        acquired = await conn.scalar(select(func.pg_try_advisory_lock(key)))
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                await conn.execute(select(func.pg_advisory_unlock(key)))
+
+
+# Run a job over leases in id order. Every batch is its own short
+# transaction that also saves the checkpoint, so a crash loses at most the
+# batch in flight, a rerun the same day resumes after the last committed
+# one, and row locks on leases are held for one batch at a time.
+async def run_job(job, today: date, session_factory=AsyncSessionLocal, batch_size: int = None) -> int:
+    async with job_lock(job.name, session_factory) as acquired:
+        if not acquired:
+            logger.info("%s is running in another process; skipped", job.name)
+            return 0
+        return await _run_batches(job, today, session_factory, batch_size or settings.SCHEDULER_BATCH_SIZE)
+
+
+async def _run_batches(job, today: date, session_factory, batch_size: int) -> int:
+    async with session_factory() as db:
+        last_id = await load_checkpoint(db, job.name, today)
+    if last_id is None:
+        return 0
+
+    total = 0
+    while True:
+        async with session_factory() as db:
+            if db.bind.dialect.name == "postgresql":
+                # Fail the batch rather than queue behind user writes; the next run resumes it
+                await db.execute(text(f"SET LOCAL lock_timeout = {int(settings.SCHEDULER_LOCK_TIMEOUT_MS)}"))
+            rows = (await db.execute(
+                job.query(today).where(Lease.id > last_id).order_by(Lease.id).limit(batch_size)
+            )).all()
+            if rows:
+                total += await job.apply(db, rows, today)
+                last_id = rows[-1].id
+            done = len(rows) < batch_size
+            await save_checkpoint(db, job.name, today, last_id, completed=done)
+            await db.commit()
+        if done:
+            return total
+        await asyncio.sleep(settings.SCHEDULER_BATCH_PAUSE)
+
+
+# Periodic runner for the daily lease jobs. Each job runs to completion
+# once per day; later wakeups that day find it completed and do nothing.
+class Scheduler:
+    def __init__(self, jobs=None, session_factory=AsyncSessionLocal, interval=None):
+        self.jobs = jobs or [ExpireLeases(), CreateRentCharges()]
+        self.session_factory = session_factory
+        self.interval = interval or settings.SCHEDULER_INTERVAL
+        self._stop = None
+        self._task = None
+
+    async def run_once(self, today: date = None) -> dict:
+        today = today or date.today()
+        results = {}
+        for job in self.jobs:
+            results[job.name] = await run_job(job, today, self.session_factory)
+            if results[job.name]:
+                logger.info("%s: %d rows on %s", job.name, results[job.name], today)
+        return results
+
+    async def run(self):
+        self._stop = asyncio.Event()
+        while not self._stop.is_set():
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Scheduled lease jobs failed")
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self):
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._stop is not None:
+            self._stop.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+
+scheduler = Scheduler()
+
+
+if __name__ == "__main__":
+    # Standalone worker, or a single pass from cron with --once
+    import app.versioning  # noqa: F401  keep table versions current from this process too
+
+    parser = argparse.ArgumentParser(description="Expire leases and create upcoming rent charges")
+    parser.add_argument("--once", action="store_true", help="run each job once and exit")
+    parser.add_argument("--date", type=date.fromisoformat, help="treat this day as today (with --once)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if args.once:
+        print(asyncio.run(scheduler.run_once(args.date)))
+    else:
+        asyncio.run(scheduler.run())
@@ -1,6 +1,13 @@
 from datetime import date, datetime
 from pydantic import BaseModel, EmailStr, Field, HttpUrl
-from typing import Optional
+from typing import Dict, Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Envelope returned by every paginated list endpoint
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
 
 class UserCreate(BaseModel):
     full_name: str
@@ -161,3 +168,120 @@ class TicketResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+# Nested responses, loaded through the strategies in app/repository.py
+class UnitLease(LeaseResponse):
+    tenant: TenantResponse
+
+class UnitDetail(UnitResponse):
+    lease: Optional[UnitLease] = None  # current (Active) lease only
+
+class PropertyDetail(PropertyResponse):
+    units: List[UnitDetail]
+
+class LeasePayment(BaseModel):
+    id: int
+    amount_paid: float
+    payment_status: str
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class LeaseWithPayments(LeaseResponse):
+    payments: List[LeasePayment]
+
+class TenantLeases(TenantResponse):
+    leases: List[LeaseWithPayments]
+
+
+# Rows accepted by the bulk import endpoints: the create schemas plus the
+# foreign keys the single-row endpoints infer from the current user
+class UnitImport(UnitCreate):
+    property_id: int
+
+class TenantImport(TenantCreate):
+    user_id: int
+
+class LeaseImport(LeaseCreate):
+    tenant_id: int
+    unit_id: int
+    lease_status: str = "Active"
+
+class ImportedRow(BaseModel):
+    row: int
+    id: int
+
+class ImportRowError(BaseModel):
+    row: int
+    errors: List[Dict]
+
+class ImportReport(BaseModel):
+    inserted: int
+    failed: int
+    created: List[ImportedRow]
+    errors: List[ImportRowError]
+
+
+# Dashboard aggregates for a single property
+class PropertySummary(BaseModel):
+    property_id: int
+    name: str
+    total_units: int
+    units_by_status: Dict[str, int]
+    active_leases: int
+    expected_rent: float
+    collected_rent: float
+    outstanding_rent: float
+
+class DashboardSummary(BaseModel):
+    month: str  # YYYY-MM
+    total_units: int
+    active_leases: int
+    expected_rent: float
+    collected_rent: float
+    outstanding_rent: float
+    open_tickets: int
+    properties: List[PropertySummary]
+
+
+# Arrears report row for one lease, tenant, unit or property
+class ArrearsRow(BaseModel):
+    id: int
+    name: Optional[str] = None
+    leases: int
+    charged: float
+    paid: float
+    balance: float  # negative when in credit
+    current: float
+    days_31_60: float
+    days_61_90: float
+    days_over_90: float
+
+
+# Search results, best match first
+class TicketSearchHit(BaseModel):
+    rank: float
+    ticket: TicketResponse
+
+class PropertySearchHit(BaseModel):
+    rank: float
+    property: PropertyResponse
+
+
+# Batch status transitions; expected_status makes a change conditional on
+# the row's current status
+class StatusChange(BaseModel):
+    id: int
+    status: str = Field(..., min_length=1)
+    expected_status: Optional[str] = None
+
+class RejectedStatusChange(BaseModel):
+    id: int
+    reason: str  # conflict or not_found
+    current_status: Optional[str] = None
+
+class BatchStatusReport(BaseModel):
+    updated: List[int]
+    rejected: List[RejectedStatusChange]
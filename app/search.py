@@ -0,0 +1,169 @@
+import bisect
+import math
+import re
+import threading
+
+from fastapi import HTTPException
+from sqlalchemy import REAL, and_, cast, func, literal, literal_column, or_, select
+
+from app.models import Property, SupportTicket, TableVersion
+from app.pagination import decode_cursor, encode_cursor
+
+TOKEN = re.compile(r"\w+", re.UNICODE)
+
+# Postgres' default ts_rank weights for labels D, C, B, A
+WEIGHTS = {"A": 1.0, "B": 0.4, "C": 0.2, "D": 0.1}
+
+
+def tokenize(value) -> list:
+    return TOKEN.findall(value.lower()) if value else []
+
+
+# Required and excluded terms of a websearch-style query for the local
+# index; quotes are dropped and "or" is not supported there
+def parse_query(q: str):
+    required, excluded = [], []
+    for word in q.split():
+        if word.lower() == "or":
+            continue
+        (excluded if word.startswith("-") else required).extend(tokenize(word))
+    return required, excluded
+
+
+# A searchable model: its text columns with their weight labels and the
+# columns results can be filtered on. The Postgres document expression has
+# to match the GIN index in alembic/versions/c81d0e2f5a17 exactly.
+class SearchSpec:
+    def __init__(self, model, fields: dict, filters=()):
+        self.model = model
+        self.fields = fields
+        self.filters = filters
+        self.table = model.__tablename__
+        self.document = literal_column("(" + " || ".join(
+            f"setweight(to_tsvector('english', coalesce({name}, '')), '{label}')"
+            for name, label in fields.items()
+        ) + ")")
+
+
+tickets = SearchSpec(SupportTicket, {"subject": "A", "description": "B"}, filters=("status", "tenant_id"))
+properties = SearchSpec(Property, {"name": "A", "location": "B", "description": "C"}, filters=("location", "admin_id"))
+
+
+def _after(cursor: str):
+    payload = decode_cursor(cursor)
+    try:
+        return float(payload["r"]), int(payload["id"])
+    except (KeyError, TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _page(hits, limit: int) -> dict:
+    next_cursor = None
+    if len(hits) > limit:
+        hits = hits[:limit]
+        rank, last = hits[-1]
+        next_cursor = encode_cursor({"r": rank, "id": last.id})
+    return {"items": [{"rank": rank, "row": row} for rank, row in hits], "next_cursor": next_cursor}
+
+
+# Postgres: websearch syntax ("quoted phrases", -exclusions, or), matched
+# through the GIN index and ordered by ts_rank_cd, then id
+def _search_postgres(db, spec: SearchSpec, q: str, filters: dict, limit: int, cursor: str = None) -> dict:
+    query = func.websearch_to_tsquery(literal_column("'english'"), q)
+    rank = func.ts_rank_cd(spec.document, query)
+    stmt = select(spec.model, rank).where(spec.document.op("@@")(query))
+    for name, value in filters.items():
+        stmt = stmt.where(getattr(spec.model, name) == value)
+    if cursor:
+        last_rank, last_id = _after(cursor)
+        # Ranks are REAL; compare as REAL so a rank survives the round trip exactly
+        last_rank = cast(literal(last_rank), REAL)
+        stmt = stmt.where(or_(rank < last_rank, and_(rank == last_rank, spec.model.id > last_id)))
+    rows = db.execute(stmt.order_by(rank.desc(), spec.model.id).limit(limit + 1)).all()
+    return _page([(rank_value, row) for row, rank_value in rows], limit)
+
+
+# Fallback for SQLite and other backends without full-text search: an
+# in-process inverted index, rebuilt whenever the table's version (see
+# app/versioning.py) has moved on since it was built. Meant for tests and
+# development; rebuilds read the whole table.
+class InvertedIndex:
+    def __init__(self, spec: SearchSpec):
+        self.spec = spec
+        self.version = None
+        self.postings = {}
+        self.attributes = {}
+        self._lock = threading.Lock()
+
+    def refresh(self, db):
+        version = db.scalar(select(TableVersion.version).where(TableVersion.table_name == self.spec.table)) or 0
+        if version == self.version:
+            return
+        with self._lock:
+            if version == self.version:
+                return
+            model = self.spec.model
+            columns = [getattr(model, name) for name in (*self.spec.fields, *self.spec.filters)]
+            postings, attributes = {}, {}
+            for row in db.execute(select(model.id, *columns)):
+                doc_id, values = row[0], row[1:]
+                for (name, label), text in zip(self.spec.fields.items(), values):
+                    for token in tokenize(text):
+                        docs = postings.setdefault(token, {})
+                        docs[doc_id] = docs.get(doc_id, 0.0) + WEIGHTS[label]
+                attributes[doc_id] = dict(zip(self.spec.filters, values[len(self.spec.fields):]))
+            self.postings, self.attributes, self.version = postings, attributes, version
+
+    # Every required term must match and no excluded one; score is
+    # weighted term frequency times idf
+    def search(self, terms, excluded, filters: dict) -> list:
+        postings = [self.postings.get(term) for term in set(terms)]
+        excluded = [self.postings.get(term, {}) for term in set(excluded)]
+        if not postings or not all(postings):
+            return []
+        postings.sort(key=len)
+        total = len(self.attributes)
+        scores = {}
+        for doc_id, weight in postings[0].items():
+            attributes = self.attributes[doc_id]
+            if any(attributes[name] != value for name, value in filters.items()):
+                continue
+            if any(doc_id in docs for docs in excluded):
+                continue
+            score = 0.0
+            for docs in postings:
+                if doc_id not in docs:
+                    break
+                score += docs[doc_id] * math.log(1 + total / len(docs))
+            else:
+                scores[doc_id] = round(score, 6)
+        return sorted(((-score, doc_id) for doc_id, score in scores.items()))
+
+
+_indexes = {}
+
+
+def _search_local(db, spec: SearchSpec, q: str, filters: dict, limit: int, cursor: str = None) -> dict:
+    index = _indexes.get(spec.table)
+    if index is None:
+        index = _indexes.setdefault(spec.table, InvertedIndex(spec))
+    index.refresh(db)
+    ranked = index.search(*parse_query(q), filters)
+    start = 0
+    if cursor:
+        last_rank, last_id = _after(cursor)
+        start = bisect.bisect_right(ranked, (-last_rank, last_id))
+    ranked = ranked[start:start + limit + 1]
+
+    rows = {row.id: row for row in db.scalars(select(spec.model).where(spec.model.id.in_([i for _, i in ranked])))}
+    return _page([(-score, rows[doc_id]) for score, doc_id in ranked if doc_id in rows], limit)
+
+
+# Ranked, keyset-paginated search; items are {"rank", "row"} dicts
+def search(db, spec: SearchSpec, q: str, filters: dict, limit: int, cursor: str = None) -> dict:
+    if not tokenize(q):
+        raise HTTPException(status_code=400, detail="q must contain at least one word")
+    filters = {name: value for name, value in filters.items() if value is not None}
+    if db.bind.dialect.name == "postgresql":
+        return _search_postgres(db, spec, q, filters, limit, cursor)
+    return _search_local(db, spec, q, filters, limit, cursor)
@@ -0,0 +1,40 @@
+from fastapi.responses import Response
+from pydantic import TypeAdapter
+from sqlalchemy import select
+
+from app.schemas import Page
+
+
+# Fast path for list endpoints. Selects only the columns a response schema
+# needs and turns the row tuples into JSON with one precompiled TypeAdapter,
+# instead of loading ORM objects that FastAPI then re-validates attribute
+# by attribute and encodes with jsonable_encoder.
+class PageSerializer:
+    def __init__(self, schema, model):
+        self.fields = list(schema.model_fields)
+        self.model = model
+        self.adapter = TypeAdapter(Page[schema])
+
+    # select() of exactly the columns the schema exposes
+    def select(self):
+        return select(*(getattr(self.model, name) for name in self.fields))
+
+    def dump(self, page: dict) -> bytes:
+        items = [{name: row._mapping[name] for name in self.fields} for row in page["items"]]
+        content = self.adapter.validate_python({"items": items, "next_cursor": page["next_cursor"]})
+        return self.adapter.dump_json(content)
+
+    def render(self, page: dict, response: Response = None) -> Response:
+        return json_response(self.dump(page), response)
+
+
+# Response for an already encoded JSON body. Endpoints that return a
+# Response themselves pass the injected one along so headers set by
+# dependencies (e.g. ETag) are kept.
+def json_response(body: bytes, response: Response = None) -> Response:
+    rendered = Response(body, media_type="application/json")
+    if response is not None:
+        for name, value in response.headers.items():
+            if name != "content-length":
+                rendered.headers[name] = value
+    return rendered
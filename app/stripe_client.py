@@ -0,0 +1,134 @@
+import asyncio
+import random
+import time
+import uuid
+
+import stripe
+
+from app import metrics
+from app.config import STRIPE_SECRET_KEY, settings
+
+
+# Raised instead of calling Stripe while the circuit breaker is open
+class StripeUnavailable(Exception):
+    pass
+
+
+# Opens after `threshold` consecutive failures and lets a single trial
+# call through once `reset_after` seconds have passed.
+class CircuitBreaker:
+    def __init__(self, threshold: int, reset_after: float):
+        self.threshold = threshold
+        self.reset_after = reset_after
+        self.failures = 0
+        self.opened_at = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_after:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        if self.state == "open":
+            return False
+        if self.state == "half-open":
+            # Restart the timer so only one trial call goes out at a time
+            self.opened_at = time.monotonic()
+        return True
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self):
+        self.failures += 1
+        if self.failures >= self.threshold:
+            self.opened_at = time.monotonic()
+
+
+def _is_retryable(exc: Exception) -> bool:
+    if isinstance(exc, (asyncio.TimeoutError, stripe.APIConnectionError, stripe.RateLimitError)):
+        return True
+    return isinstance(exc, stripe.APIError) and (exc.http_status or 500) >= 500
+
+
+# Non-blocking Stripe access: one pooled httpx.AsyncClient, a deadline per
+# call, retries with full-jitter backoff and a circuit breaker. Point
+# STRIPE_API_BASE at stripe-mock or any local fake to test against it.
+class StripeGateway:
+    def __init__(self, api_key, *, api_base=None, timeout=10.0, max_retries=2,
+                 backoff=0.25, breaker: CircuitBreaker = None):
+        self.api_key = api_key
+        self.api_base = api_base
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.breaker = breaker or CircuitBreaker(threshold=5, reset_after=30)
+        self._http_client = None
+        self._client = None
+
+    @property
+    def client(self) -> stripe.StripeClient:
+        if self._client is None:
+            self._http_client = stripe.HTTPXClient(timeout=self.timeout)
+            self._client = stripe.StripeClient(
+                self.api_key or "",
+                http_client=self._http_client,
+                base_addresses={"api": self.api_base} if self.api_base else {},
+                max_network_retries=0,  # retried here, with jitter
+            )
+        return self._client
+
+    async def _call(self, operation, fn, *args, **kwargs):
+        for attempt in range(self.max_retries + 1):
+            if not self.breaker.allow():
+                metrics.STRIPE_ERRORS.labels(operation, "circuit_open").inc()
+                raise StripeUnavailable("Stripe circuit breaker is open")
+            start = time.perf_counter()
+            try:
+                result = await asyncio.wait_for(fn(*args, **kwargs), timeout=self.timeout)
+            except Exception as exc:
+                metrics.STRIPE_LATENCY.labels(operation, "error").observe(time.perf_counter() - start)
+                metrics.STRIPE_ERRORS.labels(operation, type(exc).__name__).inc()
+                if not _is_retryable(exc):
+                    # The request reached Stripe and was rejected; Stripe itself is up
+                    self.breaker.record_success()
+                    raise
+                self.breaker.record_failure()
+                if attempt == self.max_retries:
+                    if isinstance(exc, asyncio.TimeoutError):
+                        raise StripeUnavailable("Stripe request timed out") from exc
+                    raise
+                await asyncio.sleep(random.uniform(0, self.backoff * 2 ** attempt))
+            else:
+                metrics.STRIPE_LATENCY.labels(operation, "ok").observe(time.perf_counter() - start)
+                self.breaker.record_success()
+                return result
+
+    async def create_checkout_session(self, params: dict):
+        # One idempotency key across retries so a retried create never double-charges
+        options = {"idempotency_key": str(uuid.uuid4())}
+        return await self._call(
+            "checkout.sessions.create", self.client.checkout.sessions.create_async, params=params, options=options
+        )
+
+    async def retrieve_checkout_session(self, session_id: str):
+        return await self._call("checkout.sessions.retrieve", self.client.checkout.sessions.retrieve_async, session_id)
+
+    async def aclose(self):
+        if self._http_client is not None:
+            await self._http_client.close_async()
+            self._http_client = None
+            self._client = None
+
+
+stripe_gateway = StripeGateway(
+    STRIPE_SECRET_KEY,
+    api_base=settings.STRIPE_API_BASE,
+    timeout=settings.STRIPE_TIMEOUT,
+    max_retries=settings.STRIPE_MAX_RETRIES,
+    breaker=CircuitBreaker(settings.STRIPE_BREAKER_THRESHOLD, settings.STRIPE_BREAKER_RESET),
+)
@@ -0,0 +1,129 @@
+import asyncio
+import logging
+from datetime import datetime
+
+from sqlalchemy import select, update
+
+from app.config import settings
+from app.database import AsyncSessionLocal, dialect_insert
+from app.models import Payment, StripeEvent
+
+logger = logging.getLogger(__name__)
+
+# Payment status each event type moves a payment to
+TRANSITIONS = {
+    "checkout.session.completed": "succeeded",
+    "payment_intent.payment_failed": "failed",
+}
+
+
+# Store a verified event once; redelivered event ids are ignored
+async def record_event(db, event, payload: bytes):
+    data_object = event["data"]["object"]
+    stmt = dialect_insert(db.bind, StripeEvent).values(
+        id=event["id"],
+        type=event["type"],
+        object_id=data_object.get("id"),
+        payload=payload.decode(),
+        received_at=datetime.utcnow(),
+    ).on_conflict_do_nothing(index_elements=["id"])
+    await db.execute(stmt)
+    await db.commit()
+
+
+# Apply one batch of pending events; returns how many were consumed
+async def process_batch(db, batch_size: int) -> int:
+    events = (await db.execute(
+        select(StripeEvent.id, StripeEvent.type, StripeEvent.object_id)
+        .where(StripeEvent.processed_at.is_(None))
+        .order_by(StripeEvent.received_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )).all()
+    if not events:
+        return 0
+
+    # Later events for the same payment win, as they would applied one by one
+    final_status = {}
+    for _, event_type, object_id in events:
+        if event_type in TRANSITIONS and object_id:
+            final_status[object_id] = TRANSITIONS[event_type]
+
+    by_status = {}
+    for object_id, status in final_status.items():
+        by_status.setdefault(status, []).append(object_id)
+    for status, object_ids in by_status.items():
+        await db.execute(
+            update(Payment)
+            .where(Payment.stripe_payment_intent_id.in_(object_ids))
+            .values(payment_status=status)
+        )
+
+    await db.execute(
+        update(StripeEvent)
+        .where(StripeEvent.id.in_([event_id for event_id, _, _ in events]))
+        .values(processed_at=datetime.utcnow())
+    )
+    await db.commit()
+    return len(events)
+
+
+# Background consumer of the inbox. The webhook calls notify() so new
+# events are applied right away; polling picks up anything left behind by
+# other processes or a restart.
+class StripeEventWorker:
+    def __init__(self, session_factory=AsyncSessionLocal, batch_size=None, poll_interval=None):
+        self.session_factory = session_factory
+        self.batch_size = batch_size or settings.STRIPE_EVENTS_BATCH_SIZE
+        self.poll_interval = poll_interval or settings.STRIPE_EVENTS_POLL_INTERVAL
+        self._wakeup = None
+        self._stopped = False
+        self._task = None
+
+    def notify(self):
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def drain(self) -> int:
+        total = 0
+        while True:
+            async with self.session_factory() as db:
+                processed = await process_batch(db, self.batch_size)
+            total += processed
+            if processed < self.batch_size:
+                return total
+
+    async def run(self):
+        self._wakeup = asyncio.Event()
+        while not self._stopped:
+            try:
+                await self.drain()
+            except Exception:
+                logger.exception("Failed to apply Stripe events")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    def start(self):
+        self._stopped = False
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        self._stopped = True
+        self.notify()
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+
+stripe_event_worker = StripeEventWorker()
+
+
+if __name__ == "__main__":
+    # Run the consumer on its own, e.g. with STRIPE_EVENTS_WORKER=false on the web workers
+    import app.versioning  # noqa: F401  keep table versions current from this process too
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(stripe_event_worker.run())
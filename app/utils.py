@@ -1,8 +1,16 @@
+import asyncio
+import multiprocessing
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from passlib.context import CryptContext
 from datetime import datetime, timedelta
 from jose import jwt
+from starlette.concurrency import run_in_threadpool
+
+from app import metrics
+from app.config import settings
 
-# Password hashing and verification
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 def hash_password(password: str):
@@ -11,7 +19,97 @@ def hash_password(password: str):
 def verify_password(plain_password: str, hashed_password: str):
     return pwd_context.verify(plain_password, hashed_password)
 
-# JWT token generation
+
+# Raised when the password pool already has max_pending jobs queued
+class PasswordPoolBusy(Exception):
+    pass
+
+
+# Runs in the worker process; returns the result and the CPU time spent
+def _timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+# Bounded process pool for bcrypt work so it never occupies the event loop
+# or the request threadpool. Only touched from the event loop thread.
+class PasswordPool:
+    def __init__(self, workers: int, max_pending: int, window: int = 1000):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self._latencies = deque(maxlen=window)
+        self._compute = deque(maxlen=window)
+        self._executor = None
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    async def run(self, fn, *args):
+        if self.in_flight >= self.max_pending:
+            self.rejected += 1
+            metrics.PASSWORD_POOL_REJECTED.inc()
+            raise PasswordPoolBusy()
+
+        self.in_flight += 1
+        start = time.perf_counter()
+        try:
+            if self.workers > 0:
+                loop = asyncio.get_running_loop()
+                result, compute = await loop.run_in_executor(self._get_executor(), _timed, fn, *args)
+            else:
+                result, compute = await run_in_threadpool(_timed, fn, *args)
+        finally:
+            self.in_flight -= 1
+
+        self.completed += 1
+        self._latencies.append(time.perf_counter() - start)
+        self._compute.append(compute)
+        metrics.PASSWORD_SECONDS.labels(fn.__name__).observe(compute)
+        return result
+
+    def stats(self) -> dict:
+        latencies = sorted(self._latencies)
+
+        def pct(p):
+            if not latencies:
+                return 0.0
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 3)
+
+        compute_avg = sum(self._compute) / len(self._compute) if self._compute else 0.0
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "latency_p50_ms": pct(0.50),
+            "latency_p99_ms": pct(0.99),
+            "compute_avg_ms": round(compute_avg * 1000, 3),
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_pool = PasswordPool(settings.PASSWORD_POOL_WORKERS, settings.PASSWORD_POOL_MAX_PENDING)
+
+async def hash_password_async(password: str):
+    return await password_pool.run(hash_password, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str):
+    return await password_pool.run(verify_password, plain_password, hashed_password)
+
+
 SECRET_KEY = "your_secret_key"
 ALGORITHM = "HS256"
 
@@ -0,0 +1,149 @@
+from datetime import datetime
+
+from sqlalchemy import event, select
+from sqlalchemy.engine import CursorResult
+from sqlalchemy.orm import Session, object_session
+
+from app.database import Base, dialect_insert
+from app.models import TableVersion
+
+VERSIONS_TABLE = TableVersion.__tablename__
+
+# Tables whose version counter somebody reads: conditional() ETags, the
+# response cache, the search index and the principal cache. Writes to any
+# other table skip table_versions entirely, so they take no lock on its rows.
+VERSIONED_TABLES = {"properties", "support_tickets", "tenants", "units", "users"}
+
+# Called with the set of tables a transaction changed, once it has committed
+commit_listeners = []
+
+
+# Tables whose rows go away with a row of `table` through ON DELETE CASCADE
+def _cascades(table: str) -> set:
+    found = {table}
+    pending = [table]
+    while pending:
+        parent = pending.pop()
+        for child in Base.metadata.tables.values():
+            for fk in child.foreign_keys:
+                if fk.column.table.name == parent and fk.ondelete == "CASCADE" and child.name not in found:
+                    found.add(child.name)
+                    pending.append(child.name)
+    return found
+
+
+# Bump the version of every versioned table in `tables` on the session's
+# connection, inside the transaction that changed them. It runs once per
+# transaction, just before commit, as a single upsert over the sorted
+# tables, so concurrent writers take the row locks in the same order.
+def bump(connection, tables):
+    tables = sorted(set(tables) & VERSIONED_TABLES)
+    if not tables:
+        return
+    now = datetime.utcnow()
+    stmt = dialect_insert(connection, TableVersion).values(
+        [{"table_name": table, "version": 1, "updated_at": now} for table in tables]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["table_name"],
+        set_={"version": TableVersion.version + 1, "updated_at": now},
+    )
+    connection.execute(stmt)
+
+
+def _changed(session) -> set:
+    return session.info.setdefault("uncommitted_tables", set())
+
+
+def _record(mapper, connection, target, deleted=False):
+    session = object_session(target)
+    if session is None:
+        return
+    table = mapper.local_table.name
+    _changed(session).update(_cascades(table) if deleted else {table})
+
+
+@event.listens_for(Base, "after_insert", propagate=True)
+def _after_insert(mapper, connection, target):
+    _record(mapper, connection, target)
+
+
+@event.listens_for(Base, "after_update", propagate=True)
+def _after_update(mapper, connection, target):
+    _record(mapper, connection, target)
+
+
+@event.listens_for(Base, "after_delete", propagate=True)
+def _after_delete(mapper, connection, target):
+    _record(mapper, connection, target, deleted=True)
+
+
+# INSERT/UPDATE/DELETE statements run through the session skip the flush.
+# They are recorded after they run, and only if they touched a row. With
+# RETURNING, rowcount is unreliable, so the returned rows are buffered and
+# counted instead.
+@event.listens_for(Session, "do_orm_execute")
+def _record_executed(state):
+    if not (state.is_insert or state.is_update or state.is_delete):
+        return
+    table = state.statement.table.name
+    if table == VERSIONS_TABLE:
+        return
+    result = state.invoke_statement()
+    if state.statement.returning_column_descriptions:
+        frozen = result.freeze()
+        touched = bool(frozen.data)
+        result = frozen()
+    elif isinstance(result, CursorResult):
+        touched = result.rowcount != 0
+    else:
+        touched = True  # ORM bulk INSERT, which reports no rowcount
+    if touched:
+        _changed(state.session).update(_cascades(table) if state.is_delete else {table})
+    return result
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_committing(session):
+    # Flush first: commit's own flush of pending objects comes after this hook
+    session.flush()
+    changed = session.info.get("uncommitted_tables")
+    if changed:
+        bump(session.connection(), changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_committed(session):
+    changed = session.info.pop("uncommitted_tables", None)
+    if changed:
+        for listener in commit_listeners:
+            listener(changed)
+
+
+# A rolled back transaction changed nothing; savepoints don't count
+@event.listens_for(Session, "after_transaction_end")
+def _discard_uncommitted(session, transaction):
+    if transaction.parent is None and not transaction.nested:
+        session.info.pop("uncommitted_tables", None)
+
+
+def _versions_query(tables):
+    return select(TableVersion.table_name, TableVersion.version, TableVersion.updated_at).where(
+        TableVersion.table_name.in_(tables)
+    )
+
+
+def _versions(rows, tables) -> dict:
+    versions = {table: (0, None) for table in tables}
+    for table, version, updated_at in rows:
+        versions[table] = (version, updated_at)
+    return versions
+
+
+# Current (version, updated_at) per table; tables never written read as (0, None)
+async def table_versions(connection, tables) -> dict:
+    return _versions(await connection.execute(_versions_query(tables)), tables)
+
+
+def table_versions_sync(connection, tables) -> dict:
+    return _versions(connection.execute(_versions_query(tables)), tables)
@@ -0,0 +1,19 @@
+# Picked up automatically when gunicorn starts from the project root.
+import os
+import shutil
+import tempfile
+
+# Multiprocess Prometheus metrics (app/metrics.py): each worker writes its
+# samples to files in this directory and /metrics aggregates them. It has
+# to be set before the workers import the app, and emptied on every start.
+multiproc_dir = os.environ.setdefault(
+    "PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "rental-api-metrics")
+)
+shutil.rmtree(multiproc_dir, ignore_errors=True)
+os.makedirs(multiproc_dir, exist_ok=True)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,97 @@
+"""Compare login latency with bcrypt in the process pool vs the threadpool.
+
+Drives POST /auth/token with concurrent clients through the ASGI transport
+against a throwaway SQLite database, while probing GET / to show how much
+password work starves unrelated endpoints.
+
+    python -m scripts.bench_login --requests 200 --concurrency 32 --workers 4
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench_login.db")
+os.environ.setdefault("SECRET_KEY", "bench")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+
+
+def percentile(samples, p):
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+
+def summarize(samples, elapsed):
+    return {
+        "count": len(samples),
+        "throughput_rps": round(len(samples) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(samples, 0.50) * 1000, 1),
+        "p95_ms": round(percentile(samples, 0.95) * 1000, 1),
+        "p99_ms": round(percentile(samples, 0.99) * 1000, 1),
+    }
+
+
+async def run_mode(client, requests, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    login_samples, probe_samples = [], []
+    done = asyncio.Event()
+
+    async def login():
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.post("/auth/token", data={"username": "bench@example.com", "password": "bench"})
+            response.raise_for_status()
+            login_samples.append(time.perf_counter() - start)
+
+    async def probe():
+        while not done.is_set():
+            start = time.perf_counter()
+            await client.get("/")
+            probe_samples.append(time.perf_counter() - start)
+            await asyncio.sleep(0.01)
+
+    prober = asyncio.create_task(probe())
+    start = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await prober
+    return {"login": summarize(login_samples, elapsed), "probe": summarize(probe_samples, elapsed)}
+
+
+async def main(args):
+    import httpx
+    from app import utils
+    from app.database import Base, async_engine, engine
+    from app.main import app
+
+    Base.metadata.create_all(engine)
+    transport = httpx.ASGITransport(app=app)
+    results = {}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for mode, workers in (("threadpool", 0), ("process_pool", args.workers)):
+            utils.password_pool = utils.PasswordPool(workers, max_pending=args.requests)
+            if not results:
+                await client.post("/auth/register", json={
+                    "full_name": "Bench", "email": "bench@example.com",
+                    "password": "bench", "phone_number": "0",
+                })
+            await run_mode(client, args.workers, args.workers)  # warm up the workers
+            results[mode] = await run_mode(client, args.requests, args.concurrency)
+            utils.password_pool.shutdown()
+    await async_engine.dispose()
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,106 @@
+"""Compare list serialization through response_model vs the TypeAdapter fast path.
+
+Seeds a throwaway SQLite database, then builds one page of GET /leases/
+three ways: ORM objects run through FastAPI's response_model pipeline and
+rendered with the stdlib JSONResponse, the same pipeline rendered with
+ORJSONResponse, and row tuples dumped by app.serializers.PageSerializer.
+
+    python -m scripts.bench_serialization --limit 200 --repeat 50
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench_serialization.db")
+os.environ.setdefault("SECRET_KEY", "bench")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = fn()
+        samples.append(time.perf_counter() - start)
+    return body, {
+        "median_ms": round(statistics.median(samples) * 1000, 3),
+        "min_ms": round(min(samples) * 1000, 3),
+    }
+
+
+def run(args):
+    from fastapi.responses import JSONResponse, ORJSONResponse
+    from fastapi.routing import serialize_response
+    from fastapi.utils import create_model_field
+    from sqlalchemy import select
+
+    import app.models  # noqa: F401  register every table
+    from app.database import Base, SessionLocal, engine
+    from app.models import Lease
+    from app.pagination import PageParams, keyset, page_of, paginate_rows
+    from app.schemas import LeaseResponse, Page
+    from app.serializers import PageSerializer
+    from scripts.seed import seed
+
+    Base.metadata.create_all(engine)
+    with SessionLocal() as session:
+        seed(session, properties=args.properties, units=args.units, payments=1, tickets=0)
+
+    params = PageParams(limit=args.limit, cursor=None, sort="id", order="asc")
+    field = create_model_field("response", Page[LeaseResponse], mode="serialization")
+    serializer = PageSerializer(LeaseResponse, Lease)
+    loop = asyncio.new_event_loop()
+
+    def response_model(response_class):
+        def build():
+            with SessionLocal() as session:
+                rows = session.execute(keyset(select(Lease), Lease, params)).scalars().all()
+                content = loop.run_until_complete(serialize_response(field=field, response_content=page_of(rows, params)))
+            return response_class(content).body
+        return build
+
+    def fast_path():
+        with SessionLocal() as session:
+            return serializer.dump(paginate_rows(session, serializer.select(), Lease, params))
+
+    results = {}
+    bodies = {}
+    for name, fn in [
+        ("response_model+json", response_model(JSONResponse)),
+        ("response_model+orjson", response_model(ORJSONResponse)),
+        ("rows+type_adapter", fast_path),
+    ]:
+        bodies[name], results[name] = timed(fn, args.repeat)
+    loop.close()
+
+    # Every path must produce the same document
+    decoded = [json.loads(body) for body in bodies.values()]
+    assert all(doc == decoded[0] for doc in decoded), "serializers disagree"
+
+    baseline = results["response_model+json"]["median_ms"]
+    for result in results.values():
+        result["speedup"] = round(baseline / result["median_ms"], 2) if result["median_ms"] else None
+    return {"items": len(decoded[0]["items"]), "repeat": args.repeat, "results": results}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--limit", type=int, default=200, help="items per page")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--properties", type=int, default=10)
+    parser.add_argument("--units", type=int, default=25, help="units per property")
+    args = parser.parse_args(argv)
+
+    from app.config import settings
+
+    settings.PAGE_SIZE_MAX = max(settings.PAGE_SIZE_MAX, args.limit)
+    print(json.dumps(run(args), indent=2))
+
+
+if __name__ == "__main__":
+    main()
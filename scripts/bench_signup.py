@@ -0,0 +1,111 @@
+"""Measure signup throughput and the database work behind each signup.
+
+Drives POST /auth/register with concurrent clients through the ASGI
+transport against a throwaway SQLite database and counts the SQL statements
+and commits each registration issues. bcrypt dominates a real signup, so the
+run is repeated with password hashing stubbed out to show the database path
+on its own. Save a run with --output and compare a later one against it with
+--baseline, e.g. before and after a change to the registration path.
+
+    python -m scripts.bench_signup --requests 1000 --concurrency 16 --output signup.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench_signup.db")
+os.environ.setdefault("SECRET_KEY", "bench")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+
+from scripts.bench_login import summarize  # noqa: E402
+
+
+async def run_mode(client, mode, requests, concurrency, counters):
+    semaphore = asyncio.Semaphore(concurrency)
+    samples = []
+
+    async def signup(i):
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.post("/auth/register", json={
+                "full_name": f"Bench {i}", "email": f"{mode}-{i}@example.com",
+                "password": "bench", "phone_number": str(i),
+            })
+            response.raise_for_status()
+            samples.append(time.perf_counter() - start)
+
+    counters.update(statements=0, commits=0)
+    start = time.perf_counter()
+    await asyncio.gather(*(signup(i) for i in range(requests)))
+    elapsed = time.perf_counter() - start
+    result = summarize(samples, elapsed)
+    result["statements_per_signup"] = round(counters["statements"] / requests, 2)
+    result["commits_per_signup"] = round(counters["commits"] / requests, 2)
+    return result
+
+
+async def main(args):
+    import httpx
+    from sqlalchemy import event
+    from app import utils
+    from app.database import Base, async_engine, engine
+    from app.main import app
+    from app.routers import auth
+
+    Base.metadata.create_all(engine)
+    counters = {"statements": 0, "commits": 0}
+
+    @event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+    def count_statement(*_):
+        counters["statements"] += 1
+
+    @event.listens_for(async_engine.sync_engine, "commit")
+    def count_commit(*_):
+        counters["commits"] += 1
+
+    async def no_hash(password):
+        return "bench"
+
+    utils.password_pool = utils.PasswordPool(args.workers, max_pending=args.bcrypt_requests)
+    transport = httpx.ASGITransport(app=app)
+    results = {}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # The first signup creates the admin; keep it out of the samples
+        await client.post("/auth/register", json={
+            "full_name": "Admin", "email": "admin@example.com", "password": "bench", "phone_number": "0",
+        })
+        results["bcrypt"] = await run_mode(client, "bcrypt", args.bcrypt_requests, args.concurrency, counters)
+        hash_password, auth.hash_password = auth.hash_password, no_hash
+        try:
+            results["db_only"] = await run_mode(client, "db_only", args.requests, args.concurrency, counters)
+        finally:
+            auth.hash_password = hash_password
+    utils.password_pool.shutdown()
+    await async_engine.dispose()
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        for mode, result in results.items():
+            before = baseline.get(mode)
+            if before and before["throughput_rps"]:
+                result["throughput_change"] = f"{result['throughput_rps'] / before['throughput_rps'] - 1:+.1%}"
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--bcrypt-requests", type=int, default=50, help="signups in the run with real hashing")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="results of an earlier run to compare throughput against")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,192 @@
+"""Report sequential scans in the queries each router issues.
+
+Drives a representative set of GET endpoints as an admin and as a tenant
+against DATABASE_URL, captures every SELECT they send through either
+engine, runs EXPLAIN on it and lists the tables that were read with a full
+scan. On Postgres, enable_seqscan is switched off for the EXPLAIN so a
+remaining Seq Scan means no usable index exists, not just that the table
+is small. DATABASE_URL has to be set explicitly; otherwise a throwaway
+SQLite file is used, never the database configured in .env.
+
+    DATABASE_URL=postgresql://... python -m scripts.index_advisor --seed
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import tempfile
+from collections import defaultdict
+
+# Before app.config loads .env, whose DATABASE_URL is the deployed database
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/index_advisor.db")
+
+from sqlalchemy import event, select  # noqa: E402
+
+SQLITE_FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+POSTGRES_SEQ_SCAN = re.compile(r"Seq Scan on (\w+)")
+
+
+def endpoints(ids):
+    return [
+        ("admin", "/properties/"),
+        ("admin", f"/properties/{ids['property']}"),
+        ("admin", f"/units/?property_id={ids['property']}&status=available"),
+        ("admin", f"/units/{ids['unit']}"),
+        ("admin", "/tenant/"),
+        ("admin", f"/tenant/{ids['tenant']}"),
+        ("admin", f"/leases/?unit_id={ids['unit']}"),
+        ("admin", f"/leases/{ids['lease']}"),
+        ("admin", f"/payments/?tenant_id={ids['tenant']}"),
+        ("admin", f"/payments/?lease_id={ids['lease']}"),
+        ("admin", f"/payments/{ids['payment']}"),
+        ("admin", f"/tickets/?tenant_id={ids['tenant']}&status=open"),
+        ("admin", "/users/?role=Tenant"),
+        ("admin", "/dashboard/summary"),
+        ("tenant", "/auth/me"),
+        ("tenant", "/tenant/"),
+        ("tenant", "/leases/"),
+        ("tenant", "/tickets/my-tickets"),
+    ]
+
+
+def sample_ids(session):
+    from app import models
+
+    lease = session.scalars(select(models.Lease).order_by(models.Lease.id).limit(1)).first()
+    if lease is None:
+        raise SystemExit("Database has no leases; run with --seed or python -m scripts.seed first")
+    return {
+        "property": session.scalar(select(models.Unit.property_id).where(models.Unit.id == lease.unit_id)),
+        "unit": lease.unit_id,
+        "tenant": lease.tenant_id,
+        "lease": lease.id,
+        "payment": session.scalar(select(models.Payment.id).where(models.Payment.lease_id == lease.id).limit(1)),
+        "tenant_user": session.scalar(select(models.Tenant.user_id).where(models.Tenant.id == lease.tenant_id)),
+    }
+
+
+def token_for(session, user_id):
+    from app import models, utils
+
+    user = session.get(models.User, user_id)
+    return utils.create_access_token(
+        data={"sub": user.email, "role": user.role, "id": user.id, "full_name": user.full_name}
+    )
+
+
+def full_scans(dialect, plan_rows):
+    tables = set()
+    for row in plan_rows:
+        if dialect == "sqlite":
+            match = SQLITE_FULL_SCAN.match(row[-1])
+        else:
+            match = POSTGRES_SEQ_SCAN.search(row[0])
+        if match:
+            tables.add(match.group(1))
+    return sorted(tables)
+
+
+async def explain(engine, async_engine, kind, statement, parameters):
+    dialect = engine.dialect.name
+    prefix = "EXPLAIN QUERY PLAN " if dialect == "sqlite" else "EXPLAIN "
+    if kind == "sync":
+        with engine.connect() as conn:
+            if dialect == "postgresql":
+                conn.exec_driver_sql("SET enable_seqscan = off")
+            return conn.exec_driver_sql(prefix + statement, parameters).all()
+    async with async_engine.connect() as conn:
+        if dialect == "postgresql":
+            await conn.exec_driver_sql("SET enable_seqscan = off")
+        return (await conn.exec_driver_sql(prefix + statement, parameters)).all()
+
+
+async def run(args):
+    import httpx
+    from app.database import Base, SessionLocal, async_engine, engine
+    from app.main import app
+
+    if args.seed:
+        from scripts.seed import seed
+
+        Base.metadata.create_all(engine)
+        with SessionLocal() as session:
+            seed(session, properties=args.properties, units=args.units)
+
+    with SessionLocal() as session:
+        ids = sample_ids(session)
+        tokens = {"admin": token_for(session, args.admin_id), "tenant": token_for(session, ids["tenant_user"])}
+
+    captured = []
+
+    def capture(kind):
+        def listener(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT"):
+                captured.append((kind, statement, parameters))
+        return listener
+
+    sync_listener, async_listener = capture("sync"), capture("async")
+    event.listen(engine, "before_cursor_execute", sync_listener)
+    event.listen(async_engine.sync_engine, "before_cursor_execute", async_listener)
+
+    report = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://advisor") as client:
+        for role, path in endpoints(ids):
+            captured.clear()
+            response = await client.get(path, headers={"Authorization": f"Bearer {tokens[role]}"})
+            queries = list(captured)
+            captured.clear()
+
+            entry = {"role": role, "path": path, "status": response.status_code, "queries": []}
+            for kind, statement, parameters in queries:
+                plan = await explain(engine, async_engine, kind, statement, parameters)
+                entry["queries"].append({"sql": " ".join(statement.split()), "full_scans": full_scans(engine.dialect.name, plan)})
+            report.append(entry)
+
+    event.remove(engine, "before_cursor_execute", sync_listener)
+    event.remove(async_engine.sync_engine, "before_cursor_execute", async_listener)
+    await async_engine.dispose()
+    return report
+
+
+def print_report(report):
+    by_table = defaultdict(set)
+    for entry in report:
+        flagged = [q for q in entry["queries"] if q["full_scans"]]
+        marker = "SCAN" if flagged else "ok  "
+        print(f"{marker} {entry['status']} {entry['role']:<6} GET {entry['path']}  ({len(entry['queries'])} queries)")
+        for query in flagged:
+            print(f"       full scan on {', '.join(query['full_scans'])}: {query['sql'][:160]}")
+            for table in query["full_scans"]:
+                by_table[table].add(entry["path"])
+
+    print()
+    if not by_table:
+        print("No sequential scans found.")
+    for table, paths in sorted(by_table.items()):
+        print(f"{table}: scanned by {len(paths)} endpoint(s): {', '.join(sorted(paths))}")
+    return by_table
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seed", action="store_true", help="seed a synthetic portfolio first")
+    parser.add_argument("--properties", type=int, default=20)
+    parser.add_argument("--units", type=int, default=25)
+    parser.add_argument("--admin-id", type=int, default=1, help="user id to query as admin")
+    parser.add_argument("--json", action="store_true", help="print the raw report as JSON")
+    parser.add_argument("--strict", action="store_true", help="exit non-zero if any scan is found")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(report, indent=2))
+        scanned = any(q["full_scans"] for entry in report for q in entry["queries"])
+    else:
+        scanned = bool(print_report(report))
+    raise SystemExit(1 if args.strict and scanned else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+"""Load-test every router against a seeded database and record percentiles.
+
+Seeds DATABASE_URL (a throwaway SQLite file unless one is given) with a
+synthetic portfolio, then drives each endpoint with concurrent clients
+through the ASGI transport. Stripe is replaced by an in-process fake with
+a configurable latency, so /payments/pay still goes through the gateway's
+retries, breaker and metrics without leaving the machine. Throughput and
+p50/p95/p99 per endpoint are written as JSON; pass a previous run as
+--baseline to fail when an endpoint's p95 regressed.
+
+    python -m scripts.loadtest --properties 20 --units 25 --output loadtest.json
+    python -m scripts.loadtest --baseline main.json --max-regression 0.25
+"""
+import argparse
+import asyncio
+import hashlib
+import hmac
+import itertools
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from sqlalchemy import select
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/loadtest.db")
+os.environ.setdefault("SECRET_KEY", "loadtest")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+os.environ.setdefault("STRIPE_PUBLIC_KEY", "whsec_loadtest")  # read as the webhook secret
+os.environ.setdefault("STRIPE_EVENTS_WORKER", "false")
+
+from scripts.bench_login import summarize  # noqa: E402
+
+
+# Stands in for stripe.StripeClient: checkout.sessions.create_async / retrieve_async
+class FakeStripe:
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.ids = itertools.count(1)
+        self.checkout = SimpleNamespace(sessions=self)
+
+    async def create_async(self, params=None, options=None):
+        await asyncio.sleep(self.latency)
+        session_id = f"cs_test_{next(self.ids)}"
+        return SimpleNamespace(id=session_id, url=f"https://checkout.stripe.test/{session_id}", payment_status="unpaid")
+
+    async def retrieve_async(self, session_id):
+        await asyncio.sleep(self.latency)
+        return SimpleNamespace(id=session_id, payment_status="paid")
+
+
+def webhook_request(secret: str, event_ids):
+    event_id = f"evt_loadtest_{next(event_ids)}"
+    payload = json.dumps({
+        "id": event_id,
+        "object": "event",
+        "type": "checkout.session.completed",
+        "data": {"object": {"id": f"cs_unknown_{event_id}", "object": "checkout.session"}},
+    })
+    timestamp = int(time.time())
+    signature = hmac.new(secret.encode(), f"{timestamp}.{payload}".encode(), hashlib.sha256).hexdigest()
+    return {"content": payload, "headers": {"Stripe-Signature": f"t={timestamp},v1={signature}",
+                                            "Content-Type": "application/json"}}
+
+
+# A CSV upload of `rows` records for the bulk import endpoints
+def import_request(filename: str, header: str, row, rows: int):
+    content = "\n".join([header] + [row(i) for i in range(rows)]) + "\n"
+    return lambda: {"files": {"file": (filename, content.encode(), "text/csv")}}
+
+
+# Rows for the batch status endpoints; each keeps its current status, so
+# repeated requests do the full write without changing the dataset
+def batch_changes(session, model, status, limit):
+    rows = session.scalars(select(model.id).where(model.status == status).order_by(model.id).limit(limit)).all()
+    return [{"id": row, "status": status, "expected_status": status} for row in rows]
+
+
+# (name, role, method, path, request kwargs factory)
+def scenarios(ids, creds, secret, batches, import_rows):
+    event_ids = itertools.count(1)
+    none = lambda: {}  # noqa: E731
+    return [
+        ("auth.token", None, "POST", "/auth/token",
+         lambda: {"data": {"username": creds["email"], "password": creds["password"]}}),
+        ("auth.me", "tenant", "GET", "/auth/me", none),
+        ("users.list", "admin", "GET", "/users/?role=Tenant", none),
+        ("properties.list", "admin", "GET", "/properties/", none),
+        ("properties.get", "admin", "GET", f"/properties/{ids['property']}", none),
+        ("properties.details", "admin", "GET", f"/properties/{ids['property']}/details", none),
+        ("units.list", "admin", "GET", f"/units/?property_id={ids['property']}", none),
+        ("units.get", "admin", "GET", f"/units/{ids['unit']}", none),
+        ("tenant.list", "admin", "GET", "/tenant/", none),
+        ("tenant.leases", "admin", "GET", f"/tenant/{ids['tenant']}/leases", none),
+        ("leases.list", "admin", "GET", "/leases/", none),
+        ("leases.get", "admin", "GET", f"/leases/{ids['lease']}", none),
+        ("payments.list", "admin", "GET", f"/payments/?tenant_id={ids['tenant']}", none),
+        ("payments.get", "admin", "GET", f"/payments/{ids['payment']}", none),
+        ("payments.pay", "tenant", "POST", "/payments/pay", lambda: {"json": {"amount_paid": 100}}),
+        ("payments.webhook", None, "POST", "/payments/webhook", lambda: webhook_request(secret, event_ids)),
+        ("tickets.list", "admin", "GET", "/tickets/?status=open", none),
+        ("tickets.mine", "tenant", "GET", "/tickets/my-tickets", none),
+        ("tickets.create", "tenant", "POST", "/tickets/",
+         lambda: {"json": {"subject": "Leaking tap", "description": "Kitchen tap drips"}}),
+        ("tickets.batch_status", "admin", "PATCH", "/tickets/status", lambda: {"json": batches["tickets"]}),
+        ("units.batch_status", "admin", "PATCH", "/units/status", lambda: {"json": batches["units"]}),
+        ("properties.import", "admin", "POST", "/properties/import",
+         import_request("properties.csv", "name,location,description,image_url",
+                        lambda i: f"Imported {i},District {i % 12},,https://example.com/{i}.jpg", import_rows)),
+        ("units.import", "admin", "POST", "/units/import",
+         import_request("units.csv", "name,status,property_id",
+                        lambda i: f"Imported {i},available,{ids['property']}", import_rows)),
+        ("tenant.export", "admin", "GET", "/tenant/export?format=csv", none),
+        ("leases.export", "admin", "GET", "/leases/export?format=csv", none),
+        ("payments.export", "admin", "GET", "/payments/export?format=csv", none),
+        ("reports.arrears", "admin", "GET", "/reports/arrears?group_by=property", none),
+        ("reports.arrears_export", "admin", "GET", "/reports/arrears/export?group_by=lease&format=csv", none),
+        ("search.tickets", "admin", "GET", "/search/tickets?q=issue", none),
+        ("search.properties", "tenant", "GET", "/search/properties?q=property", none),
+        ("dashboard.summary", "admin", "GET", "/dashboard/summary", none),
+    ]
+
+
+async def drive(client, method, path, kwargs, headers, requests, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    samples, errors = [], 0
+
+    async def one():
+        nonlocal errors
+        request = kwargs()
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.request(
+                method, path, headers={**headers, **request.pop("headers", {})}, **request
+            )
+            samples.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return {**summarize(samples, time.perf_counter() - start), "errors": errors}
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# Endpoints whose p95 grew by more than max_regression against the baseline
+def regressions(results, baseline, max_regression):
+    found = []
+    for name, result in results.items():
+        before = baseline.get("endpoints", {}).get(name)
+        if not before or not before["p95_ms"]:
+            continue
+        change = result["p95_ms"] / before["p95_ms"] - 1
+        if change > max_regression:
+            found.append({"endpoint": name, "baseline_p95_ms": before["p95_ms"],
+                          "p95_ms": result["p95_ms"], "change": round(change, 3)})
+    return found
+
+
+async def main(args):
+    import httpx
+
+    import app.models  # noqa: F401  register every table
+    from app.config import STRIPE_WEBHOOK_SECRET
+    from app.database import Base, SessionLocal, async_engine, engine
+    from app.main import app
+    from app.models import SupportTicket, Unit
+    from app.stripe_client import stripe_gateway
+    from scripts.index_advisor import sample_ids, token_for
+    from scripts.seed import seed
+
+    Base.metadata.create_all(engine)
+    with SessionLocal() as session:
+        dataset = seed(session, args.properties, args.units, args.payments, args.tickets, seed=args.seed)
+        ids = sample_ids(session)
+        batches = {
+            "tickets": batch_changes(session, SupportTicket, "open", args.batch_size),
+            "units": batch_changes(session, Unit, "occupied", args.batch_size),
+        }
+        headers = {
+            "admin": {"Authorization": f"Bearer {token_for(session, dataset['admin']['id'])}"},
+            "tenant": {"Authorization": f"Bearer {token_for(session, ids['tenant_user'])}"},
+            None: {},
+        }
+    creds = {"email": dataset["tenant"]["email"], "password": dataset["tenant"]["password"]}
+    stripe_gateway._client = FakeStripe(args.stripe_latency / 1000)
+
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+        for name, role, method, path, kwargs in scenarios(ids, creds, STRIPE_WEBHOOK_SECRET, batches, args.import_rows):
+            if args.only and name not in args.only:
+                continue
+            # bcrypt bound: a full run of logins would dominate the wall clock
+            requests = args.login_requests if name == "auth.token" else args.requests
+            await drive(client, method, path, kwargs, headers[role], args.warmup, args.concurrency)
+            results[name] = await drive(client, method, path, kwargs, headers[role], requests, args.concurrency)
+            print(f"{name:24} {results[name]}", file=sys.stderr)
+    await async_engine.dispose()
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "dialect": engine.dialect.name,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "stripe_latency_ms": args.stripe_latency,
+            "dataset": {key: value for key, value in dataset.items() if key not in ("admin", "tenant")},
+        },
+        "endpoints": results,
+    }
+    if args.baseline:
+        with open(args.baseline) as f:
+            report["regressions"] = regressions(results, json.load(f), args.max_regression)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    if report.get("regressions"):
+        for found in report["regressions"]:
+            print(f"p95 regression on {found['endpoint']}: {found['baseline_p95_ms']}ms -> "
+                  f"{found['p95_ms']}ms ({found['change']:+.0%})", file=sys.stderr)
+        return 1
+    if any(result["errors"] for result in results.values()):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--properties", type=int, default=20)
+    parser.add_argument("--units", type=int, default=25, help="units per property")
+    parser.add_argument("--payments", type=int, default=12, help="months of payment history per lease")
+    parser.add_argument("--tickets", type=int, default=2, help="tickets per tenant")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--requests", type=int, default=200, help="requests per endpoint")
+    parser.add_argument("--login-requests", type=int, default=20, help="requests to POST /auth/token")
+    parser.add_argument("--warmup", type=int, default=5, help="unmeasured requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--batch-size", type=int, default=50, help="rows per batch status PATCH")
+    parser.add_argument("--import-rows", type=int, default=25, help="rows per bulk import upload")
+    parser.add_argument("--stripe-latency", type=float, default=50, help="fake Stripe latency in ms")
+    parser.add_argument("--only", nargs="*", help="endpoint names to run, e.g. properties.list")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--baseline", help="JSON report of an earlier run to compare p95 against")
+    parser.add_argument("--max-regression", type=float, default=0.25, help="allowed p95 growth, 0.25 = 25%%")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,136 @@
+"""Seed a database with a synthetic rental portfolio.
+
+Creates one admin plus N properties x M units, a tenant and lease for most
+units, monthly payment history per lease and a few support tickets per
+tenant. Rows are written with multi-row INSERTs, so tens of thousands of
+rows take seconds. Passwords are hashed once and shared by every account.
+Without DATABASE_URL in the environment it seeds a throwaway SQLite file,
+never the database configured in .env.
+
+    DATABASE_URL=sqlite:///./seed.db python -m scripts.seed --properties 50 --units 40
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+from datetime import date, datetime, timedelta
+
+# Before app.config loads .env, whose DATABASE_URL is the deployed database
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/seed.db")
+
+from sqlalchemy import insert, update  # noqa: E402
+
+ADMIN_EMAIL = "admin@example.com"
+ADMIN_PASSWORD = "admin"
+TENANT_PASSWORD = "tenant"
+TICKET_STATUSES = ["open", "open", "In Progress", "Closed"]
+
+
+def _insert(session, model, rows, chunk_size=5000):
+    ids = []
+    for i in range(0, len(rows), chunk_size):
+        stmt = insert(model).returning(model.id, sort_by_parameter_order=True)
+        ids.extend(session.scalars(stmt, rows[i:i + chunk_size]).all())
+    return ids
+
+
+def seed(session, properties=20, units=25, payments=12, tickets=2, occupancy=0.85, seed=0) -> dict:
+    from app import models, utils
+
+    rng = random.Random(seed)
+    today = date.today()
+    tenant_hash = utils.hash_password(TENANT_PASSWORD)
+
+    admin_id = _insert(session, models.User, [{
+        "full_name": "Admin", "email": ADMIN_EMAIL, "password": utils.hash_password(ADMIN_PASSWORD),
+        "role": "Admin", "is_active": True,
+    }])[0]
+
+    property_ids = _insert(session, models.Property, [
+        {"name": f"Property {p}", "location": f"District {p % 12}", "description": "", "image_url": "", "admin_id": admin_id}
+        for p in range(properties)
+    ])
+
+    unit_ids = _insert(session, models.Unit, [
+        {"name": f"P{pid}-U{u}", "status": "available", "property_id": pid}
+        for pid in property_ids for u in range(units)
+    ])
+    leased_units = [uid for uid in unit_ids if rng.random() < occupancy]
+
+    user_ids = _insert(session, models.User, [
+        {"full_name": f"Tenant {i}", "email": f"tenant{i}@example.com", "password": tenant_hash,
+         "role": "Tenant", "is_active": True}
+        for i in range(len(leased_units))
+    ])
+    tenant_ids = _insert(session, models.Tenant, [
+        {"user_id": uid, "full_name": f"Tenant {i}", "email": f"tenant{i}@example.com", "phone_number": f"555-{i:07d}"}
+        for i, uid in enumerate(user_ids)
+    ])
+
+    lease_rows = []
+    for tenant_id, unit_id in zip(tenant_ids, leased_units):
+        start = today - timedelta(days=rng.randint(30, 3 * 365))
+        end = start + timedelta(days=365 * rng.choice([1, 2, 3]))
+        lease_rows.append({
+            "tenant_id": tenant_id, "unit_id": unit_id, "start_date": start, "end_date": end,
+            "rent_amount": float(rng.randrange(500, 3000, 50)), "deposit_amount": 1000.0,
+            "lease_status": "Active" if end >= today else "Expired", "created_at": start, "updated_at": start,
+        })
+    lease_ids = _insert(session, models.Lease, lease_rows)
+    if leased_units:
+        session.execute(update(models.Unit).where(models.Unit.id.in_(leased_units)).values(status="occupied"))
+
+    payment_rows = []
+    for lease_id, lease in zip(lease_ids, lease_rows):
+        for month in range(payments):
+            paid_at = datetime.combine(lease["start_date"], datetime.min.time()) + timedelta(days=30 * month)
+            if paid_at.date() > today:
+                break
+            payment_rows.append({
+                "tenant_id": lease["tenant_id"], "lease_id": lease_id, "amount_paid": lease["rent_amount"],
+                "payment_status": "succeeded" if rng.random() < 0.9 else "failed", "created_at": paid_at,
+            })
+    _insert(session, models.Payment, payment_rows)
+
+    ticket_rows = [
+        {"tenant_id": tenant_id, "subject": f"Issue {t} for tenant {tenant_id}",
+         "description": rng.choice(["Leaking tap", "Broken heater", "Noisy neighbours", "Door lock stuck"]),
+         "status": rng.choice(TICKET_STATUSES), "created_at": datetime.utcnow() - timedelta(days=rng.randint(0, 365))}
+        for tenant_id in tenant_ids for t in range(tickets)
+    ]
+    _insert(session, models.SupportTicket, ticket_rows)
+    session.commit()
+
+    return {
+        "admin": {"id": admin_id, "email": ADMIN_EMAIL, "password": ADMIN_PASSWORD},
+        "tenant": {"id": user_ids[0], "email": "tenant0@example.com", "password": TENANT_PASSWORD} if user_ids else None,
+        "properties": len(property_ids),
+        "units": len(unit_ids),
+        "tenants": len(tenant_ids),
+        "leases": len(lease_ids),
+        "payments": len(payment_rows),
+        "tickets": len(ticket_rows),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--properties", type=int, default=20)
+    parser.add_argument("--units", type=int, default=25, help="units per property")
+    parser.add_argument("--payments", type=int, default=12, help="months of payment history per lease")
+    parser.add_argument("--tickets", type=int, default=2, help="tickets per tenant")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    import app.models  # noqa: F401  register every table
+    from app.database import Base, SessionLocal, engine
+
+    Base.metadata.create_all(engine)
+    with SessionLocal() as session:
+        summary = seed(session, args.properties, args.units, args.payments, args.tickets, seed=args.seed)
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()